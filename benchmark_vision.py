@@ -0,0 +1,173 @@
+"""
+Offline benchmark for the vision pipeline.
+
+Feeds a recorded video file or a folder of images through the same stages the headwear runs,
+with no camera, display or speech: decode, resize into the frame buffer, YOLO, depth,
+proximity scoring and the tracker's announce decision. Prints per-stage p50/p95/p99 latency,
+throughput and peak RSS as JSON.
+
+Usage:
+    python benchmark_vision.py recordings/walk.mp4
+    python benchmark_vision.py recordings/frames/ --backend onnxruntime --depth-every 5 --output bench.json
+"""
+import os
+import json
+import time
+import resource
+import argparse
+
+import cv2
+import numpy as np
+
+from config.settings import FRAME_SIZE, DETECTOR_BACKEND, TRACKER_DETECT_EVERY
+from core.vision.detectors import create_detector, available_backends
+from core.vision.depth_estimation import load_depth_model, run_depth_estimation
+from core.vision.frame_buffer import FrameRingBuffer
+from core.vision.motion_gate import SceneChangeGate
+from core.vision.proximity import ProximityEngine
+from core.vision.tracker import ObjectTracker
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+STAGES = ('decode', 'resize', 'detect', 'depth', 'proximity', 'announce', 'total')
+
+
+def iter_source(source):
+    """Yield (frame, decode_seconds) from a video file or an image folder."""
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            start = time.perf_counter()
+            frame = cv2.imread(os.path.join(source, name), cv2.IMREAD_COLOR)
+            elapsed = time.perf_counter() - start
+            if frame is not None:
+                yield frame, elapsed
+        return
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise SystemExit(f"Cannot open {source}")
+    try:
+        while True:
+            start = time.perf_counter()
+            ok, frame = cap.read()
+            elapsed = time.perf_counter() - start
+            if not ok:
+                return
+            yield frame, elapsed
+    finally:
+        cap.release()
+
+
+def summarize(samples):
+    if not samples:
+        return {'count': 0}
+    values = np.array(samples) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'count': len(values), 'mean_ms': round(float(values.mean()), 3), 'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3), 'p99_ms': round(float(p99), 3), 'max_ms': round(float(values.max()), 3)}
+
+
+def run_benchmark(source, backend=DETECTOR_BACKEND, frame_size=FRAME_SIZE, depth_every=1,
+                  detect_every=TRACKER_DETECT_EVERY, motion_gate=False, max_frames=None, warmup=3):
+    detector = create_detector(backend)
+    depth_net = load_depth_model()
+    frames = FrameRingBuffer(size=frame_size)
+    proximity = ProximityEngine()
+    tracker = ObjectTracker()
+    gate = SceneChangeGate() if motion_gate else None
+
+    timings = {stage: [] for stage in STAGES}
+    depth_map = None
+    announcements = 0
+    processed = 0
+    started = None
+
+    for index, (frame, decode_time) in enumerate(iter_source(source)):
+        if max_frames is not None and index >= max_frames + warmup:
+            break
+        record = index >= warmup
+        if record and started is None:
+            started = time.perf_counter()
+        stage_times = {'decode': decode_time}
+        now = time.time()
+
+        start = time.perf_counter()
+        frames.publish(frame, now)
+        image = frames.latest().image
+        stage_times['resize'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if index % detect_every == 0 or not tracker.tracks:
+            if gate is not None:
+                detections = gate.detect(image, lambda f: detector.detect([f])[0])
+            else:
+                detections = detector.detect([image])[0]
+            confident = detections[detections['score'] >= 0.65]
+            tracker.update(confident['box'], confident['score'],
+                           [detector.names[int(c)] for c in confident['class_id']], now)
+        else:
+            tracker.propagate(now)
+        stage_times['detect'] = time.perf_counter() - start
+
+        if depth_map is None or index % depth_every == 0:
+            start = time.perf_counter()
+            depth_map = run_depth_estimation(image, depth_net)
+            stage_times['depth'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stats = proximity.score(depth_map, tracker.boxes(now), [track.class_name for track in tracker.tracks])
+        stage_times['proximity'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        announcements += len(tracker.mark_close(stats['close']))
+        stage_times['announce'] = time.perf_counter() - start
+
+        stage_times['total'] = sum(stage_times.values())
+        if record:
+            processed += 1
+            for stage, value in stage_times.items():
+                timings[stage].append(value)
+
+    wall = time.perf_counter() - started if started is not None else 0.0
+    return {
+        'source': source,
+        'backend': backend,
+        'frame_size': list(frame_size),
+        'depth_every': depth_every,
+        'detect_every': detect_every,
+        'motion_gate': motion_gate,
+        'frames': processed,
+        'fps': round(processed / wall, 2) if wall else 0.0,
+        'announcements': announcements,
+        'inferences_skipped': gate.skipped if gate is not None else 0,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'stages': {stage: summarize(samples) for stage, samples in timings.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the headwear vision pipeline on recorded input.")
+    parser.add_argument("source", help="video file or folder of images")
+    parser.add_argument("--backend", default=DETECTOR_BACKEND, choices=available_backends())
+    parser.add_argument("--width", type=int, default=FRAME_SIZE[0])
+    parser.add_argument("--height", type=int, default=FRAME_SIZE[1])
+    parser.add_argument("--depth-every", type=int, default=1, help="run MiDaS every N frames")
+    parser.add_argument("--detect-every", type=int, default=TRACKER_DETECT_EVERY, help="run YOLO every N frames")
+    parser.add_argument("--motion-gate", action="store_true", help="skip YOLO on static scenes")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--warmup", type=int, default=3, help="frames excluded from the statistics")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.source, args.backend, (args.width, args.height), args.depth_every,
+                           args.detect_every, args.motion_gate, args.max_frames, args.warmup)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
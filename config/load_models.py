@@ -1,6 +1,144 @@
-from ultralytics import YOLO
-from tensorflow.keras.models import load_model
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-# Load models
-LANG_MODEL = load_model('./models/language_selector.keras')
-yolo_model = YOLO("./models/yolov5n.pt")
\ No newline at end of file
+import psutil
+
+from config.settings import LANG_MODEL_PATH, MODEL_PRELOAD_WORKERS, CURRENCY_BACKEND, CURRENCY_MODELS, \
+    CURRENCY_CONF_THRESHOLD
+
+
+class ModelRegistry:
+    """
+    Loads every model at most once, on first use.
+
+    Loaders are registered with a priority; preload() warms the registered models on a thread
+    pool in priority order (lowest first) so boot can overlap with the startup sound, and any
+    get() for a model that is mid-load simply waits for that load instead of starting another.
+    report() prints how long each load took and how much resident memory it added.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._locks = {}
+        self._stats = {}
+        self._registry_lock = threading.Lock()
+        self._process = psutil.Process()
+
+    def register(self, name, loader, priority=100, preload=True):
+        with self._registry_lock:
+            self._loaders[name] = (loader, priority, preload)
+            self._locks[name] = threading.Lock()
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get(self, name):
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"No model registered as '{name}'")
+
+        with self._locks[name]:
+            if name not in self._models:
+                loader = self._loaders[name][0]
+                rss_before = self._process.memory_info().rss
+                start = time.perf_counter()
+                model = loader()
+                elapsed = time.perf_counter() - start
+                rss_delta = self._process.memory_info().rss - rss_before
+                self._stats[name] = (elapsed, rss_delta, threading.current_thread().name)
+                print(f"[Models] Loaded {name} in {elapsed:.2f}s (+{rss_delta / 2 ** 20:.0f} MB)")
+                self._models[name] = model
+        return self._models[name]
+
+    def preload(self, names=None, workers=MODEL_PRELOAD_WORKERS):
+        """Start loading models in the background in priority order. Returns the executor's futures."""
+        if names is None:
+            names = [name for name, (_, _, preload) in self._loaders.items() if preload]
+        names = sorted(names, key=lambda name: self._loaders[name][1])
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ModelPreload")
+        futures = {name: executor.submit(self._safe_get, name) for name in names}
+        executor.shutdown(wait=False)
+        return futures
+
+    def _safe_get(self, name):
+        try:
+            return self.get(name)
+        except Exception as e:
+            print(f"[Models] Failed to preload {name}: {e}")
+            return None
+
+    def report(self):
+        """Print the per-model load time and memory table; memory is approximate for parallel loads."""
+        if not self._stats:
+            print("[Models] No models loaded yet.")
+            return
+        total_time = sum(elapsed for elapsed, _, _ in self._stats.values())
+        print("[Models] Startup load report (RSS deltas overlap when models load in parallel):")
+        for name, (elapsed, rss_delta, thread) in sorted(self._stats.items(), key=lambda item: -item[1][0]):
+            print(f"  {name:<24} {elapsed:7.2f}s  {rss_delta / 2 ** 20:8.1f} MB  [{thread}]")
+        print(f"  {'total load time':<24} {total_time:7.2f}s  "
+              f"RSS now {self._process.memory_info().rss / 2 ** 20:.0f} MB")
+
+
+def _load_keras(path):
+    from tensorflow.keras.models import load_model
+    return load_model(path)
+
+
+def _load_detector():
+    from core.vision.detectors import create_detector
+    return create_detector()  # backend picked by DETECTOR_BACKEND in config/settings.py
+
+
+def _load_currency_detector():
+    from core.vision.detectors import create_detector
+    return create_detector(CURRENCY_BACKEND, CURRENCY_MODELS[CURRENCY_BACKEND], conf_threshold=CURRENCY_CONF_THRESHOLD)
+
+
+def _load_text_detector():
+    from core.vision.text_regions import load_text_detector
+    return load_text_detector()
+
+
+def _load_depth_model():
+    from core.vision.depth_estimation import load_depth_model
+    return load_depth_model()
+
+
+def _load_intent_classifier():
+    from config.settings import training_phrases, command_labels
+    from core.nlp.intent_classifier import CommandClassifier
+    return CommandClassifier(training_phrases, command_labels)
+
+
+def _warm_up_ollama():
+    from core.nlp.intent_classifier import warm_up_ollama
+    warm_up_ollama()
+    return True
+
+
+def _load_text2text(model):
+    from transformers import pipeline
+    return pipeline("text2text-generation", model=model)
+
+
+models = ModelRegistry()
+# Lower priority numbers load first: the camera pipeline is needed the moment boot finishes
+models.register('yolo', _load_detector, priority=0)
+models.register('midas', _load_depth_model, priority=1)
+models.register('ollama_embeddings', _warm_up_ollama, priority=2)
+models.register('intent_classifier', _load_intent_classifier, priority=3)
+models.register('language_selector', lambda: _load_keras(LANG_MODEL_PATH), priority=4, preload=False)
+for _language in ('english', 'twi'):
+    models.register(f'command_classifier_{_language}',
+                    lambda language=_language: _load_keras(f"./models/{language}/command_classifier.keras"),
+                    priority=5, preload=False)
+models.register('currency', _load_currency_detector, priority=6, preload=False)
+models.register('text_detector', _load_text_detector, priority=6, preload=False)
+models.register('spelling_corrector', lambda: _load_text2text("oliverguhr/spelling-correction-english-base"),
+                priority=10, preload=False)
+models.register('grammar_corrector', lambda: _load_text2text("prithivida/grammar_error_correcter_v1"),
+                priority=10, preload=False)
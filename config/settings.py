@@ -1,3 +1,4 @@
+import os
 import cv2
 import threading
 # from ultralytics import YOLO
@@ -6,8 +7,87 @@ import threading
 # Initialize these outside your loop once
 last_frame_time = 0
 last_depth_time = 0
+DETECTOR_BACKEND = "pytorch"  # "pytorch" (ultralytics), "onnxruntime" or "opencv"
+DETECTOR_MODELS = {
+    'pytorch': './models/yolov5n.pt',
+    'onnxruntime': './models/yolov5n.onnx',
+    'opencv': './models/yolov5n.onnx',
+}
+DETECTOR_INPUT_SIZE = 640  # square network input; frames are letterboxed to it
+DETECTOR_THREADS = 4  # intra-op CPU threads for the detector backend
+DETECTOR_GRAPH_OPTIMIZATION = "all"  # onnxruntime graph optimization: disable, basic, extended or all
+DETECTOR_MAX_BATCH = 4  # frames per detector call when several producers submit at once
+DETECTOR_BATCH_WAIT_MS = 5  # how long the micro-batcher holds the first frame waiting for company
+DETECTOR_CONF_THRESHOLD = 0.25
+DETECTOR_IOU_THRESHOLD = 0.45
+CURRENCY_BACKEND = "pytorch"  # detector backend for the banknote model, same choices as DETECTOR_BACKEND
+CURRENCY_MODELS = {
+    'pytorch': './models/currency.pt',
+    'onnxruntime': './models/currency.onnx',
+    'opencv': './models/currency.onnx',
+}
+CURRENCY_CONF_THRESHOLD = 0.4
+CURRENCY_BURST_FRAMES = 5  # frames voted over per count
+CURRENCY_MATCH_IOU = 0.3  # IoU (on size-normalized boxes) linking a note across burst frames
+CURRENCY_MIN_PRESENCE = 0.5  # share of burst frames a note must appear in to be counted
+CURRENCY_MIN_CONFIDENCE = 0.5  # below this the spoken total comes with a retry hint
+UPLOAD_MAX_BYTES = 800 * 1024  # byte budget for image uploads (OCR.space free tier caps files at 1 MB)
+UPLOAD_JPEG_QUALITIES = (90, 80, 70, 60)  # JPEG qualities tried, best first, before downscaling
+UPLOAD_MIN_SIDE = 640  # never downscale uploads below this many pixels on the shorter edge
+TEXT_DETECTOR_MODEL = "./models/frozen_east_text_detection.pb"
+TEXT_DETECTOR_INPUT = (640, 480)  # EAST input (width, height); both must be multiples of 32
+TEXT_CONF_THRESHOLD = 0.5
+TEXT_NMS_THRESHOLD = 0.4
+TEXT_REGION_PADDING = 0.3  # padding around each cropped text block, as a fraction of its line height
+OCR_BACKEND = "tesseract"  # preferred OCR engine: tesseract (local) or ocr.space (remote)
+OCR_LANGUAGE = "eng"
+OCR_LOCAL_WORKERS = 2  # Tesseract processes reading text blocks in parallel
+OCR_TESSERACT_CONFIG = "--oem 1 --psm 6"  # LSTM engine, each crop treated as one block of text
+OCR_REMOTE_TIMEOUT = 10  # seconds before an OCR.space request is abandoned
+OCR_REMOTE_RETRY_AFTER = 60  # seconds the remote engine is skipped after a failed request
+OCR_LOCAL_SLOW_MS = 4000  # local average latency above which a faster remote engine is preferred
+RESULT_CACHE_SIZE = 16  # OCR / currency results remembered per cache
+RESULT_CACHE_TTL = 120  # seconds a cached result can be reused
+RESULT_CACHE_MAX_DISTANCE = 6  # perceptual-hash bits (of 64) two captures may differ by and still match
 DEPTH_INTERVAL = 7  # seconds between depth estimation
+DEPTH_MIN_INTERVAL = 1.0  # fastest depth refresh, used when the scene is changing quickly
+DEPTH_MOTION_FULL_RATE = 0.08  # mean thumbnail change (0-1) at which depth runs at DEPTH_MIN_INTERVAL
+DEPTH_MAX_AGE = 15  # seconds after which a depth map carries no proximity confidence
+DEPTH_FLOW_ENABLED = True  # warp the last depth map along optical flow between MiDaS passes
+DEPTH_FLOW_SIZE = (160, 120)  # resolution the optical flow is computed at
+DEPTH_FLOW_INTERVAL = 0.2  # seconds between flow updates of the propagated depth map
+DEPTH_FLOW_MAX_ERROR = 0.12  # mean photometric error (0-1) after warping at which flow confidence reaches 0
+DEPTH_FLOW_MIN_CONFIDENCE = 0.5  # below this flow confidence a fresh MiDaS pass is requested
+MOTION_GATE_THRESHOLD = 0.02  # mean thumbnail change (0-1) below which the scene counts as static
+MOTION_GATE_MAX_REUSE = 2.0  # seconds detections may be reused on a static scene before re-running YOLO
+TRACKER_DETECT_EVERY = 3  # run YOLO every K processed frames; tracks are propagated in between
+TRACKER_IOU_THRESHOLD = 0.3  # minimum IoU to match a detection to an existing track
+TRACKER_CENTROID_DISTANCE = 0.5  # fallback match radius, as a fraction of the track's box diagonal
+TRACKER_MAX_MISSES = 3  # detector runs a track may go unmatched before it is dropped
+TRACKER_APPROACH_RATE = 0.6  # relative box-area growth per second that re-announces a close track
+# Per-class (near depth, min near-pixel fraction): raw depth values below the first count as near,
+# and a box is close once that share of its pixels is near. 'default' covers unlisted classes.
+PROXIMITY_THRESHOLDS = {
+    'default': (200, 0.15),
+    'person': (200, 0.10),
+    'car': (250, 0.10),
+    'bicycle': (220, 0.10),
+    'motorcycle': (250, 0.10),
+}
+PROXIMITY_PERCENTILE = 10  # per-box depth percentile reported alongside the median
+PROXIMITY_BINS = 16  # quantile bins in the integral histogram used for per-box statistics
+PROXIMITY_MIN_CONFIDENCE = 0.35  # detection confidence x depth freshness needed to call an object close
+# Raw MiDaS edges splitting the occupancy grid into near/mid/far. MiDaS outputs inverse relative depth,
+# so larger is nearer: pixels above the first edge are near, between the edges mid, below the second far.
+OBSTACLE_BAND_DEPTHS = (400, 200)
+OBSTACLE_MIN_FRACTION = 0.3  # share of a column's pixels in the near band that counts as an obstacle
+OBSTACLE_ROWS = (0.2, 0.8)  # vertical slice of the depth map (fractions of height) the grid looks at
 FRAME_INTERVAL = 1 / 15  # target ~15 FPS (adjust as needed)
+FRAME_SIZE = (640, 480)  # (width, height) every buffered camera frame is stored at
+FRAME_BUFFER_SLOTS = 8  # preallocated slots in the camera frame ring buffer
+HEADLESS = True  # production headwear has no screen; set False for the debug preview window
+PREVIEW_MAX_FPS = 10  # cap for the optional preview window
+PREVIEW_SHOW_DEPTH = True  # overlay a small depth colormap in the preview
 cached_depth_vis = None
 cached_depth_raw = None
 SELECTED_LANGUAGE = ''
@@ -96,9 +176,42 @@ command_labels = [
 ]
 COMMAND_CLASSES = ["background", "reading", "start", "stop", "reset", "count"]
 last_play_time = 0
+ANNOUNCE_QUEUE_SIZE = 4  # pending vision announcements before the oldest is dropped
+ANNOUNCE_LABEL_COOLDOWN = 8  # seconds before the same label may be announced again
+ANNOUNCE_MAX_AGE = 3  # seconds a pending announcement stays relevant
 tts_lock = threading.Lock()
+READING_LOOKAHEAD = 1  # synthesized sentences queued ahead of the one playing in reading mode
+READING_MIN_SENTENCE_CHARS = 25  # shorter OCR fragments are joined to the next sentence
+READING_MAX_SENTENCE_CHARS = 200  # longer sentences are split at commas/semicolons
+PIPER_VOICE = None  # Piper voice name sent to the server; None uses the server's default voice
+PIPER_SPEED = 1.0  # speaking rate (1.0 = normal); sent to Piper as length_scale = 1 / speed
+TTS_CACHE_DIR = "data/tts_cache"  # content-addressed store of synthesized Piper audio
+TTS_CACHE_MEMORY_BYTES = 32 * 2 ** 20  # in-memory LRU of recently spoken clips
+TTS_CACHE_DISK_BYTES = 256 * 2 ** 20  # on-disk cap; least recently used clips are removed past it
+# Fixed prompts synthesized into the TTS cache at boot
+TTS_PREWARM_PHRASES = [
+    "Hello",
+    "Hello, how may I help you?",
+    "Please try again.",
+    "Switching to default mode.",
+    "Please say your preferred language",
+    "Reading now.",
+    "Done reading.",
+    "No text found.",
+    "No valid image to read.",
+    "Counting currency",
+    "No currency detected",
+    "Volume increased.",
+    "Volume decreased.",
+    "Please check your network connection and try again.",
+    "Shutting down the device now.",
+    "obstacle ahead",
+    "obstacle on your left",
+    "obstacle on your right",
+]
 audio_playing = threading.Event()
 LANG_MODEL_PATH = './models/language_selector.keras'
+MODEL_PRELOAD_WORKERS = 3  # threads used to warm models while the startup sound plays
 LANGUAGES = ['background', 'english', 'twi']
 translated_audio = 'data/translated/'
 translated_phrases = translated_audio + 'phrases/'
@@ -113,6 +226,20 @@ INTENT_CLASSIFIER_MODEL = "./models/knn_classifier.joblib"
 
 cap = cv2.VideoCapture(0)
 
+# ESP32 camera; override with environment variables to point the app at esp32_standin.py
+ESP32_CAMERA_URL = os.getenv("ESP32_CAMERA_URL", "http://10.156.184.165")
+ESP32_STREAM_URL = os.getenv("ESP32_STREAM_URL", ESP32_CAMERA_URL + ":81/stream")
+# Adaptive capture: (framesize index, JPEG quality) from cheapest to richest; lower quality = better image
+CAPTURE_LEVELS = [(5, 20), (6, 15), (7, 12)]
+CAPTURE_START_LEVEL = 1
+CAPTURE_BURST_LEVEL = (10, 10)  # UXGA used for reading/currency bursts
+CAPTURE_CONTROL_PERIOD = 2.0  # seconds between control decisions
+CAPTURE_LATENCY_BUDGET_MS = 150  # vision pipeline latency per processed frame
+CAPTURE_DECODE_BUDGET_MS = 15  # JPEG decode time per frame
+CAPTURE_MIN_FPS = 8  # frames per second that must arrive over the link
+CAPTURE_DOWN_AFTER = 2  # consecutive over-budget periods before stepping down
+CAPTURE_UP_AFTER = 5  # consecutive comfortable periods before stepping up
+
 # State variables
 wakeword_detected = threading.Event()
 esp32_connected = threading.Event()
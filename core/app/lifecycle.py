@@ -1,73 +1,78 @@
-import cv2
 import time
 import threading
-import numpy as np
+from concurrent.futures import wait
 
 from core.app.mode_handler import process_mode
-from tensorflow.keras.models import load_model
+from core.app.modes.vision_mode import vision_service
+from core.app.preview import PreviewThread
+from config.load_models import models
 from utils.say_in_language import say_in_language
 from core.app.command_handler import handle_command
 from core.nlp.language import detect_or_load_language
 from core.audio.audio_capture import play_audio_winsound
-from config.settings import wakeword_detected, get_mode, set_mode, get_language, set_language
+from core.tts.piper import prewarm_tts_cache
+from core.vision.camera_control import capture_controller
+from core.vision.frame_buffer import camera_frames
+from core.vision.mjpeg_stream import camera_stream
+from config.settings import wakeword_detected, get_mode, set_mode, get_language, set_language, HEADLESS
 from core.socket.esp32_listener import start_esp32_listener, broadcast_mode_update
 
 # Global state variables
 awaiting_command = False
 wakeword_processing = False
-last_frame_time = 0
-last_depth_time = 0
-cached_depth_vis = None
-cached_depth_raw = None
 AUDIO_COMMAND_MODEL = None
 transcribed_text = None
+preview = None
 
-# ESP32 stream URL
-url = "http://10.156.184.165:81/stream"
-frame_holder = {'frame': None}
-
-
-def esp32_mjpeg_stream_thread(url, frame_holder):
-    cap = cv2.VideoCapture(url)
-    if not cap.isOpened():
-        print(f"[ESP32 Camera Thread] Failed to open stream: {url}")
-        return
 
+def esp32_mjpeg_stream_thread(reader, frames):
     while True:
-        ret, frame = cap.read()
-        if ret and frame is not None:
-            frame_holder['frame'] = frame
-        else:
-            print("[ESP32 Camera Thread] Failed to read frame. Retrying...")
-            time.sleep(0.1)
+        try:
+            reader.open()
+            print(f"[ESP32 Camera Thread] Connected to {reader.url}")
+            while True:
+                frame, captured = reader.read()
+                frames.publish(frame, captured)
+        except (OSError, ConnectionError) as e:
+            print(f"[ESP32 Camera Thread] Stream error: {e}. Reconnecting...")
+            reader.close()
+            time.sleep(1.0)
 
 
 def initialize_app():
-    global AUDIO_COMMAND_MODEL
+    global AUDIO_COMMAND_MODEL, preview
 
     start_esp32_listener()
+    # Fixed prompts come from the TTS cache; synthesize any that are missing in the background
+    threading.Thread(target=prewarm_tts_cache, name="TTSPrewarm", daemon=True).start()
+    # Warm models in priority order on a thread pool while the startup sound plays
+    preloads = models.preload()
     play_audio_winsound("./data/custom_audio/deviceOn1.wav", True)
     set_language(detect_or_load_language())
     SELECTED_LANGUAGE = get_language()
     print("Selected language:", SELECTED_LANGUAGE)
     say_in_language("Hello", SELECTED_LANGUAGE, wait_for_completion=True)
 
-    AUDIO_COMMAND_MODEL = load_model(f"./models/{SELECTED_LANGUAGE}/command_classifier.keras")
+    AUDIO_COMMAND_MODEL = models.get(f"command_classifier_{SELECTED_LANGUAGE}")
 
-    # Start the ESP32 camera streaming thread
-    threading.Thread(target=esp32_mjpeg_stream_thread, args=(url, frame_holder), daemon=True).start()
+    # Start the ESP32 camera streaming thread and the (initially paused) vision service
+    threading.Thread(target=esp32_mjpeg_stream_thread, args=(camera_stream, camera_frames), daemon=True).start()
+    vision_service.start()
+    capture_controller.start(latency_source=lambda: vision_service.latency_ms)
+    if not HEADLESS:
+        preview = PreviewThread(vision_service)
+        preview.start()
 
+    wait(preloads.values())
+    models.report()
     print("[Main] Initialization complete.")
 
 
 def run_main_loop():
     global awaiting_command, wakeword_processing, transcribed_text
-    global last_frame_time, last_depth_time, cached_depth_vis, cached_depth_raw
 
-    cv2.namedWindow("Camera View", cv2.WINDOW_NORMAL)
     frozen_frame = None
-    frame_skip = 2
-    frame_count = 0
+    last_seq = 0
 
     while True:
         current_mode = get_mode()  # Always get the latest mode
@@ -81,30 +86,26 @@ def run_main_loop():
         #     awaiting_command = False
         #     wakeword_detected.clear()
 
-        # Get the latest frame from ESP32
-        frame = frame_holder.get('frame')
-        if frame is None:
+        # Block until the ESP32 delivers a frame we have not handled yet
+        packet = camera_frames.wait_for_newer(last_seq, timeout=0.5)
+        if packet is None:
             print("Waiting for ESP32 frame...")
-            time.sleep(0.05)
-            continue
-
-        frame = cv2.resize(frame, (640, 480))
-        frame_count += 1
-        if frame_count % frame_skip != 0:
             continue
+        last_seq = packet.seq
+        frame = packet.image
 
-        key = cv2.waitKey(1) & 0xFF
-        if key == ord('q') or current_mode == "shutdown":
+        if current_mode == "shutdown":
             break
 
         # Handle mode logic
         frozen_frame, updated_mode = process_mode(
-            current_mode, frame, get_language(),
-            last_frame_time, last_depth_time,
-            cached_depth_vis, cached_depth_raw, frozen_frame, transcribed_text
+            current_mode, frame, get_language(), frozen_frame, transcribed_text
         )
 
-        if updated_mode != current_mode:
+        # A stop (button, ESP32) that arrived while the handler ran wins over its return mode
+        if updated_mode != current_mode and get_mode() == current_mode:
             set_mode(updated_mode)
 
-    cv2.destroyAllWindows()
+    vision_service.shutdown()
+    if preview is not None:
+        preview.stop()
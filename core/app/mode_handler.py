@@ -1,11 +1,10 @@
-import threading
 from config.settings import set_language
 from core.app.modes.currency_mode import handle_currency_mode
 from core.app.modes.current_time_mode import get_current_time
 from core.app.modes.digital_services_mode.mobile_network import handle_save_contact_mode, handle_send_money_mode, \
     handle_get_contact_mode
 from core.app.modes.passive_camera_mode import handle_stop_mode
-from core.app.modes.vision_mode import handle_vision_mode, run_background_vision, stop_vision
+from core.app.modes.vision_mode import vision_service
 from core.app.modes.reading_mode import handle_reading_mode
 from core.app.modes.volume_control_mode import increase_volume, decrease_volume
 from core.nlp.language import set_preferred_language
@@ -13,45 +12,20 @@ from core.nlp.llm_handler import handle_chat_mode
 from core.tts.python_ttsx3 import speak
 from utils.say_in_language import say_in_language
 
-vision_thread = None
 
+def process_mode(current_mode, frame, language, frozen_frame, transcribed_text):
+    # The vision service runs continuously; modes only flip its pause/profile flags
+    if current_mode == "start":
+        vision_service.set_profile("foreground")
+        vision_service.resume()
+        return frame, current_mode
+    elif current_mode == "stop":
+        vision_service.pause()
+        return handle_stop_mode(frame), current_mode
 
-def process_mode(current_mode, frame, language, last_frame_time, last_depth_time,
-                 cached_depth_vis, cached_depth_raw, frozen_frame, transcribed_text):
-    global vision_thread
-
-    # Skip starting vision thread if in 'start' or 'stop' mode
-    if current_mode in ("start", "stop"):
-        if vision_thread and vision_thread.is_alive():
-            stop_vision.set()
-            vision_thread.join()
-        if current_mode == "start":
-            return handle_vision_mode(frame, language, last_frame_time, last_depth_time,
-                                      cached_depth_vis, cached_depth_raw, volume=1.0), current_mode
-        elif current_mode == "stop":
-            return handle_stop_mode(frame), current_mode
-
-    latest = {'frame': frame, 'language': language}
-
-    def get_frame():
-        return latest.get('frame')
-
-    def get_language():
-        return latest.get('language')
-
-    # Update latest inputs
-    latest['frame'] = frame
-    latest['language'] = language
-
-    # Start vision background mode (only for other modes)
-    if vision_thread is None or not vision_thread.is_alive():
-        stop_vision.clear()
-        vision_thread = threading.Thread(
-            target=run_background_vision,
-            args=(get_frame, get_language, last_frame_time, last_depth_time, cached_depth_vis, cached_depth_raw),
-            daemon=True
-        )
-        vision_thread.start()
+    # Keep obstacle alerts running quietly underneath every other mode
+    vision_service.set_profile("background")
+    vision_service.resume()
 
     # Handle other modes
     if current_mode == "count":
@@ -59,7 +33,7 @@ def process_mode(current_mode, frame, language, last_frame_time, last_depth_time
 
     elif current_mode == "reading":
         valid_frozen_frame = frozen_frame if frozen_frame is not None else frame
-        return handle_reading_mode(frame, language, valid_frozen_frame), "start"
+        return handle_reading_mode(frame, language, valid_frozen_frame)
 
     elif current_mode == "reset":
         set_language(set_preferred_language())
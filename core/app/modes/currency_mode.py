@@ -1,9 +1,30 @@
+from config.settings import CURRENCY_BURST_FRAMES, CURRENCY_MIN_CONFIDENCE
 from core.vision.currency import calculate_currency
+from core.vision.camera_control import capture_controller
+from core.vision.frame_buffer import camera_frames
+from core.vision.result_cache import currency_cache
 from core.tts.piper import send_text_to_tts
 from utils.say_in_language import say_in_language
 
 
 def handle_currency_mode(frame, language):
     say_in_language("Counting currency", language, wait_for_completion=True)
-    detections, total = calculate_currency(frame)
-    say_in_language(f"Currency detected: {detections}, making a total of {total} cedis", language, wait_for_completion=True)
+    # Vote over a burst captured after the prompt, not the single frame that triggered the mode
+    frames = capture_controller.capture_burst(camera_frames, CURRENCY_BURST_FRAMES) or [frame]
+    cache_key, result = currency_cache.lookup(frames[len(frames) // 2])
+    try:
+        if result is None:
+            result = calculate_currency(frames)
+            if result.notes:
+                currency_cache.store(cache_key, result)
+    except Exception as e:
+        print(f"[Currency] Detection failed: {e}")
+        say_in_language("Sorry, I could not count the currency", language, wait_for_completion=True)
+        return
+    if not result.notes:
+        say_in_language("No currency detected", language, wait_for_completion=True)
+        return
+    message = f"Currency detected: {result.summary}, making a total of {result.total:g} cedis"
+    if result.confidence < CURRENCY_MIN_CONFIDENCE:
+        message += ". I am not certain, hold the notes steady and try again"
+    say_in_language(message, language, wait_for_completion=True)
@@ -1,7 +1,3 @@
-import cv2
-
-
 def handle_stop_mode(frame):
-    resized_frame = cv2.resize(frame, (640, 480))
-    cv2.imshow("Camera View", resized_frame)
-    return resized_frame
+    # Buffered frames are already FRAME_SIZE; the optional preview thread does any displaying
+    return frame
@@ -1,36 +1,69 @@
-import cv2
 import numpy as np
-from core.vision.ocr import ocr_space_file
+from config.settings import get_mode
+from core.vision.camera_control import capture_controller
+from core.vision.frame_buffer import camera_frames
+from core.vision.ocr import ocr_engine
+from core.vision.result_cache import ocr_cache
+from core.vision.text_regions import find_text_regions, crop_regions
+from core.tts.reading_stream import sentence_reader
 from utils.say_in_language import say_in_language
 
 
 def handle_reading_mode(frame, language, _):  # frozen_frame no longer needed
     print("Reading mode activated")
 
+    # Text needs detail: grab a full-resolution frame from a short high-res burst, falling back to
+    # a private copy of the newest buffered frame so the slot can be recycled during the upload
+    burst_frame = capture_controller.capture_high_resolution()
+    packet = camera_frames.snapshot()
+    if burst_frame is not None:
+        frame = burst_frame
+    elif packet is not None:
+        frame = packet.image
+
     if frame is None or not isinstance(frame, np.ndarray):
         say_in_language("No valid image to read.", language, wait_for_completion=True)
         return None, "start"
 
-    # Resize for display/OCR consistency
-    frame = cv2.resize(frame, (640, 480))
-    cv2.imshow("Camera View", frame)
-    cv2.waitKey(1)
+    # The same page captured again reads back the previous text instantly
+    cache_key, text = ocr_cache.lookup(frame)
+    if text:
+        return frame, _read_aloud(text, language)
 
-    # Save frame to disk for OCR
-    cv2.imwrite("data/captured_image.png", frame)
+    # Find text locally first: nothing to read means no OCR at all, otherwise only the
+    # deskewed text blocks are recognized
+    try:
+        regions = find_text_regions(frame)
+        crops = crop_regions(frame, regions)
+    except Exception as e:
+        print("Text detection error, reading the whole frame:", e)
+        crops = [frame]
+    if not crops:
+        say_in_language("No text found.", language, wait_for_completion=True)
+        return frame, "start"
 
     try:
         print("Extracting text")
-        text = ocr_space_file("data/captured_image.png").strip()
+        text = ocr_engine.recognize(crops).strip()
         print("Extracted text:", text)
+        if text:
+            ocr_cache.store(cache_key, text)
     except Exception as e:
         print("OCR Error:", e)
         text = ""
 
     if text:
-        say_in_language(f"Reading now. {text}. Done reading.", language, wait_for_completion=True)
-    else:
-        say_in_language("No text found.", language, wait_for_completion=True)
+        return frame, _read_aloud(text, language)
 
-    # Return to 'start' mode either way
+    say_in_language("No text found.", language, wait_for_completion=True)
     return frame, "start"
+
+
+def _read_aloud(text, language):
+    """Stream the text sentence by sentence and return the mode to continue in."""
+    # Stop/skip come from the buttons or the ESP32. A stop that also switched modes (MODE_STOP,
+    # stop button) must survive; READ_STOP alone leaves the mode at 'reading' and returns to start.
+    if sentence_reader.read(text, language, intro="Reading now.", outro="Done reading."):
+        return "start"
+    mode = get_mode()
+    return mode if mode != "reading" else "start"
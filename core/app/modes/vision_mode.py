@@ -1,92 +1,190 @@
 import threading
-import cv2
 import time
-from collections import Counter
-from config.settings import FRAME_INTERVAL, DEPTH_INTERVAL, translated_labels, translated_numbers, translated_phrases, \
-    wakeword_detected
-from config.load_models import yolo_model
-from core.vision.object_detection import run_object_detection
-from core.audio.audio_capture import combine_audio_files
-from core.tts.piper import send_text_to_tts
-from core.vision.depth_estimation import load_depth_model, run_depth_estimation
-from twi_stuff.translate_and_say import translate_and_play
-from utils.say_in_language import say_in_language
-
-midas_net = load_depth_model()
-stop_vision = threading.Event()
-
-
-def run_background_vision(frame_func, language_func, last_frame_time, last_depth_time, cached_depth_vis,
-                          cached_depth_raw):
-    while not stop_vision.is_set():
-        frame = frame_func()
-        language = language_func()
-        if frame is None:
-            time.sleep(FRAME_INTERVAL)
-            continue
-        handle_vision_mode(frame, language, last_frame_time, last_depth_time,
-                           cached_depth_vis, cached_depth_raw, volume=0.3)
-        time.sleep(FRAME_INTERVAL)
-
-
-def handle_vision_mode(frame, language, last_frame_time, last_depth_time, cached_depth_vis, cached_depth_raw,
-                       volume=1.0):
-    current_time = time.time()
-    if current_time - last_frame_time < FRAME_INTERVAL:
-        return cached_depth_vis, cached_depth_raw, last_frame_time, last_depth_time
-
-    last_frame_time = current_time
-    small_frame = cv2.resize(frame, (640, 480))
-    detections = run_object_detection(small_frame)
-
-    if current_time - last_depth_time >= DEPTH_INTERVAL or cached_depth_raw is None:
-        print("generating new depth map")
-        cached_depth_vis, cached_depth_raw = run_depth_estimation(small_frame, midas_net)
-        last_depth_time = current_time
-
-    close_objects = []
-    for det in detections:
-        conf = det['confidence']
-        if conf < 0.65:
-            continue
-        x1, y1, x2, y2 = det['bbox']
-        class_id = det['class_id']
-        class_name = yolo_model.names[class_id]
-        object_depth_roi = cached_depth_raw[y1:y2, x1:x2]
-        if object_depth_roi.size and object_depth_roi.min() < 200:
-            close_objects.append(class_name)
-            label = f"{class_name} {conf:.2f} - CLOSE!"
-            color = (0, 0, 255)
+import numpy as np
+from config.settings import FRAME_INTERVAL, DEPTH_MAX_AGE, DEPTH_MIN_INTERVAL, DEPTH_FLOW_ENABLED, \
+    PROXIMITY_MIN_CONFIDENCE, TRACKER_DETECT_EVERY, HEADLESS, get_language
+from config.load_models import models
+from core.tts.announcer import announcer
+from core.vision.depth_propagation import DepthPropagator
+from core.vision.depth_worker import DepthWorker
+from core.vision.frame_buffer import camera_frames
+from core.vision.motion_gate import SceneChangeGate
+from core.vision.object_detection import detector_batcher
+from core.vision.occupancy import OccupancyGrid, PHRASES
+from core.vision.proximity import ProximityEngine
+from core.vision.tracker import ObjectTracker
+
+# Per-profile knobs: foreground is the dedicated object detection mode, background keeps
+# obstacle alerts running quietly while another mode (reading, chat, ...) owns the device.
+PROFILES = {
+    'foreground': {'volume': 1.0, 'frame_interval': FRAME_INTERVAL},
+    'background': {'volume': 0.3, 'frame_interval': FRAME_INTERVAL * 2},
+}
+
+
+class VisionService:
+    """
+    Long-lived object detection + depth service fed by the camera frame buffer.
+
+    The detector, the depth worker (with its cached depth map) and the timers live here for the
+    whole session, so mode switches only flip flags through pause(), resume() and set_profile().
+    Depth runs on its own DepthWorker thread; detection reads whatever depth map is newest and
+    weighs it by its age.
+    """
+
+    def __init__(self, frames=camera_frames, detector=None, depth_net=None):
+        self.frames = frames
+        self._detector = detector
+        self.depth_worker = DepthWorker(depth_net, frames, adaptive=not DEPTH_FLOW_ENABLED)
+        self.depth_propagator = DepthPropagator() if DEPTH_FLOW_ENABLED else None
+        self.proximity = ProximityEngine()
+        self.motion_gate = SceneChangeGate()
+        self.tracker = ObjectTracker()
+        self.occupancy = OccupancyGrid()
+        self._occupancy_seq = 0
+        self._frame_index = 0
+        # (timestamp, [(bbox, label, color), ...]) for the optional preview; never drawn here
+        self.annotations = (0.0, [])
+        self.last_frame_time = 0
+        self.latency_ms = 0.0  # moving average of process_frame time, read by the capture controller
+        self.profile = 'foreground'
+        self._last_seq = 0
+        self._active = threading.Event()
+        self._shutdown = threading.Event()
+        self._thread = None
+
+    @property
+    def detector(self):
+        # Resolved on first use so importing this module does not load YOLO
+        if self._detector is None:
+            self._detector = models.get('yolo')
+        return self._detector
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._shutdown.clear()
+            self._thread = threading.Thread(target=self._run, name="VisionService", daemon=True)
+            self._thread.start()
+        self.depth_worker.start()
+
+    def shutdown(self):
+        self.depth_worker.shutdown()
+        self._shutdown.set()
+        self._active.set()  # wake the worker so it can exit
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def pause(self):
+        self._active.clear()
+        self.depth_worker.pause()
+        self.motion_gate.reset()
+        self.tracker.reset()
+
+    def resume(self):
+        self._active.set()
+        self.depth_worker.resume()
+
+    @property
+    def paused(self):
+        return not self._active.is_set()
+
+    def set_profile(self, profile):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown vision profile: {profile}")
+        self.profile = profile
+
+    def _run(self):
+        while not self._shutdown.is_set():
+            if not self._active.wait(timeout=0.5):
+                continue
+            packet = self.frames.wait_for_newer(self._last_seq, timeout=FRAME_INTERVAL)
+            if packet is None or self._shutdown.is_set():
+                continue
+            self._last_seq = packet.seq
+            try:
+                started = time.perf_counter()
+                self.process_frame(packet.image, get_language())
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.latency_ms = 0.9 * self.latency_ms + 0.1 * elapsed_ms if self.latency_ms else elapsed_ms
+            except Exception as e:
+                print(f"[Vision] Error processing frame {packet.seq}: {e}")
+
+    def process_frame(self, frame, language):
+        settings = PROFILES[self.profile]
+        current_time = time.time()
+        if current_time - self.last_frame_time < settings['frame_interval']:
+            return
+
+        self.last_frame_time = current_time
+
+        # Run the detector every TRACKER_DETECT_EVERY frames; tracks carry the boxes in between
+        self._frame_index += 1
+        if self._frame_index % TRACKER_DETECT_EVERY == 0 or not self.tracker.tracks:
+            detections = self.motion_gate.detect(frame, detector_batcher.detect)
+            confident = detections[detections['score'] >= 0.65]
+            self.tracker.update(
+                confident['box'],
+                confident['score'],
+                [self.detector.names[int(class_id)] for class_id in confident['class_id']],
+                current_time,
+            )
         else:
-            label = f"{class_name} {conf:.2f}"
-            color = (0, 255, 0)
-        cv2.rectangle(small_frame, (x1, y1), (x2, y2), color, 2)
-        cv2.putText(small_frame, label, (x1, y1 - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-
-    if close_objects:
-        announce_detected_objects(language, close_objects, volume)
-
-    cv2.imshow("Camera View", small_frame)
-    return cached_depth_vis, cached_depth_raw, last_frame_time, last_depth_time
-
-
-def announce_detected_objects(language, objects, volume=0.5):
-    parts = []
-    wav_files = []
-    counts = Counter(objects)
-    for kind, count in counts.items():
-        parts.append(f"{count} {kind}" + ("s" if count > 1 else ""))
-        wav_files.append(f"{translated_labels}{kind}.wav")
-        wav_files.append(f"{translated_numbers}{count}.wav")
-
-    sentence = ", ".join(parts[:-1]) + ", and " + parts[-1] if len(parts) > 1 else parts[0]
-    sentence += " in front of you"
-
-    if not wakeword_detected.is_set():
-        threading.Thread(
-            target=say_in_language,
-            args=(sentence, language,),
-            kwargs={'wait_for_completion': False},
-            daemon=True
-        ).start()
+            self.tracker.propagate(current_time)
+
+        tracks = self.tracker.tracks
+        boxes = self.tracker.boxes(current_time)
+        class_names = [track.class_name for track in tracks]
+        confidences = np.array([track.confidence for track in tracks], dtype=np.float32)
+
+        # Older depth maps are less trustworthy; scale proximity confidence down with age. With flow
+        # propagation the map is warped to this frame and weighed by the flow confidence instead.
+        depth = self.depth_worker.latest()
+        if depth is not None and self.depth_propagator is not None:
+            keyframe = depth
+            depth = self.depth_propagator.propagate(keyframe, frame, current_time)
+            if self.depth_propagator.needs_refresh and keyframe.age >= DEPTH_MIN_INTERVAL:
+                self.depth_worker.request_refresh()
+        if depth is not None:
+            freshness = max(0.0, 1.0 - depth.age / DEPTH_MAX_AGE)
+            if self.depth_propagator is not None:
+                freshness *= self.depth_propagator.confidence
+            stats = self.proximity.score(depth.depth_map, boxes, class_names)
+            is_close = stats['close'] & (confidences * freshness >= PROXIMITY_MIN_CONFIDENCE)
+        else:
+            is_close = np.zeros(len(tracks), dtype=bool)
+        announce = self.tracker.mark_close(is_close)
+        close_objects = [track.class_name for track in announce]
+        # Cooldown per track, with the approach re-announcement as its own event
+        announce_keys = [f"track {track.track_id}" + (" approaching" if track.approach_announced else "")
+                         for track in announce]
+
+        # Once per depth refresh, warn about near obstacles no close detection already explains
+        if depth is not None and depth.seq != self._occupancy_seq and freshness > 0:
+            self._occupancy_seq = depth.seq
+            self.occupancy.update(depth.depth_map)
+            explained = self.occupancy.columns_of(boxes[is_close], frame.shape[1])
+            obstacles = [PHRASES[column] for column in self.occupancy.blocked() if column not in explained]
+            if obstacles:
+                announcer.submit(obstacles, language, kind="obstacles", volume=settings['volume'])
+
+        if not HEADLESS:
+            self.annotations = (current_time, [
+                (tuple(box), *self._label(track)) for track, box in zip(tracks, boxes.astype(int).tolist())
+            ])
+
+        if close_objects:
+            announce_detected_objects(language, close_objects, settings['volume'], announce_keys)
+
+    @staticmethod
+    def _label(track):
+        if track.close:
+            return f"#{track.track_id} {track.class_name} {track.confidence:.2f} - CLOSE!", (0, 0, 255)
+        return f"#{track.track_id} {track.class_name} {track.confidence:.2f}", (0, 255, 0)
+
+
+vision_service = VisionService()
+
+
+def announce_detected_objects(language, objects, volume=0.5, keys=None):
+    announcer.submit(objects, language, keys=keys, volume=volume)
@@ -0,0 +1,75 @@
+import time
+import threading
+
+import cv2
+
+from config.settings import PREVIEW_MAX_FPS, PREVIEW_SHOW_DEPTH, set_mode
+from core.vision.frame_buffer import camera_frames
+
+WINDOW_NAME = "Camera View"
+ANNOTATION_MAX_AGE = 0.5  # seconds before vision overlays are considered out of date
+DEPTH_INSET_SIZE = (160, 120)
+
+
+class PreviewThread:
+    """
+    Optional debug window, fully decoupled from inference.
+
+    Renders the newest buffered frame plus the latest vision overlays at no more than
+    PREVIEW_MAX_FPS. All OpenCV GUI calls (namedWindow, imshow, waitKey) happen on this one
+    thread, so headless builds simply never start it.
+    """
+
+    def __init__(self, vision_service, frames=camera_frames, max_fps=PREVIEW_MAX_FPS, show_depth=PREVIEW_SHOW_DEPTH):
+        self.vision_service = vision_service
+        self.frames = frames
+        self.interval = 1.0 / max_fps
+        self.show_depth = show_depth
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="Preview", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _render(self, packet):
+        canvas = packet.image.copy()
+        timestamp, annotations = self.vision_service.annotations
+        if not self.vision_service.paused and time.time() - timestamp < ANNOTATION_MAX_AGE:
+            for (x1, y1, x2, y2), label, color in annotations:
+                cv2.rectangle(canvas, (x1, y1), (x2, y2), color, 2)
+                cv2.putText(canvas, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+
+            depth = self.vision_service.depth_worker.latest()
+            if self.show_depth and depth is not None:
+                inset = depth.depth_map.colorize(DEPTH_INSET_SIZE)
+                canvas[:inset.shape[0], :inset.shape[1]] = inset
+        return canvas
+
+    def _run(self):
+        cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
+        last_seq = 0
+        try:
+            while not self._stop.is_set():
+                started = time.time()
+                packet = self.frames.wait_for_newer(last_seq, timeout=self.interval)
+                if packet is not None:
+                    last_seq = packet.seq
+                    cv2.imshow(WINDOW_NAME, self._render(packet))
+
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    set_mode("shutdown")
+
+                remaining = self.interval - (time.time() - started)
+                if remaining > 0:
+                    time.sleep(remaining)
+        finally:
+            cv2.destroyWindow(WINDOW_NAME)
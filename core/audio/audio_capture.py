@@ -9,12 +9,9 @@ import sounddevice as sd
 from pydub import AudioSegment
 from scipy.io.wavfile import write
 import speech_recognition as sr
-from core.nlp.intent_classifier import CommandClassifier
-from tensorflow.keras.models import load_model
 from tensorflow.keras.preprocessing.sequence import pad_sequences
-from config.settings import (
-    LANG_MODEL_PATH, N_MFCC, MAX_TIMESTEPS, COMMAND_CLASSES, command_labels, training_phrases
-)
+from config.load_models import models
+from config.settings import N_MFCC, MAX_TIMESTEPS, COMMAND_CLASSES
 from core.tts.python_ttsx3 import speak
 from twi_stuff.eng_to_twi import translate_text
 from twi_stuff.twi_recognition import record_and_transcribe
@@ -24,9 +21,6 @@ tts_lock = threading.Lock()
 audio_playing = threading.Event()
 last_play_time = 0
 
-# Models — loaded once
-LANG_MODEL = load_model(LANG_MODEL_PATH)
-
 
 def combine_audio_files(file_list, output_path="./data/audio_capture/combined_audio.wav", wait_for_completion=False,
                         priority=0):
@@ -175,7 +169,7 @@ def predict_command(audio_path, language, duration=3):
         return "background", transcribed_text
 
     print(f"this is what you said {transcribed_text}")
-    classifier = CommandClassifier(training_phrases, command_labels)
+    classifier = models.get('intent_classifier')
     predicted_label = classifier.classify(transcribed_text)
     print(f"🔮 Predicted Class: {predicted_label}")
 
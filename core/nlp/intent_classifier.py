@@ -80,8 +80,7 @@ class CommandClassifier:
 
 
 # ----------- Run Example ------------
-warm_up_ollama()
-
+# Warm-up now runs once at boot through the model registry (config/load_models.py)
 # transcribed_text = "can you tell me where i am"
 # classifier = CommandClassifier(training_phrases, command_labels)
 # label = classifier.classify(transcribed_text)
@@ -1,11 +1,11 @@
-from transformers import pipeline
-
-# Load models
-fix_spelling = pipeline("text2text-generation", model="oliverguhr/spelling-correction-english-base")
-fix_grammar = pipeline("text2text-generation", model="prithivida/grammar_error_correcter_v1")
+from config.load_models import models
 
 
 def clean_text_pipeline(text):
+    # Both pipelines load on first use through the model registry
+    fix_spelling = models.get('spelling_corrector')
+    fix_grammar = models.get('grammar_corrector')
+
     # Step 1: Spelling correction
     spelling_fixed = fix_spelling(text, max_new_tokens=512)[0]['generated_text'].strip()
     print("Spelling Corrected:", spelling_fixed)
@@ -17,8 +17,9 @@ def clean_text_pipeline(text):
     return final
 
 
-# Example usage
-raw_ocr = "angel ups et HEALTH foe Revolutionizing Health and safety 4 tho Role of Ai and Digitallzation at tea Work."
-print('Raw text: ', raw_ocr)
-final_cleaned = clean_text_pipeline(raw_ocr)
-print("\n✅ Final Cleaned Text:", final_cleaned)
+if __name__ == "__main__":
+    # Example usage
+    raw_ocr = "angel ups et HEALTH foe Revolutionizing Health and safety 4 tho Role of Ai and Digitallzation at tea Work."
+    print('Raw text: ', raw_ocr)
+    final_cleaned = clean_text_pipeline(raw_ocr)
+    print("\n✅ Final Cleaned Text:", final_cleaned)
@@ -7,6 +7,7 @@ import wave
 import speech_recognition as sr
 from config.settings import get_language, set_mode, get_mode
 from core.tts.piper import send_text_to_tts
+from core.tts.reading_stream import sentence_reader
 
 clients = set()
 clients_lock = threading.Lock()
@@ -78,9 +79,16 @@ def handle_client(conn, addr):
                     broadcast_mode_update("start")
 
                 elif command == "MODE_STOP":
+                    sentence_reader.stop()
                     set_mode("stop")
                     broadcast_mode_update("stop")
 
+                elif command == "READ_STOP":
+                    sentence_reader.stop()
+
+                elif command == "READ_SKIP":
+                    sentence_reader.skip()
+
                 elif command == "AUDIO_START":
                     audio_data = receive_audio_stream(conn)
                     if audio_data:
@@ -3,6 +3,7 @@ import threading
 from gpiozero import Button
 from utils.say_in_language import say_in_language
 from core.app.command_handler import handle_command
+from core.tts.reading_stream import sentence_reader
 from config.settings import set_mode, get_language
 
 BUTTON_PINS = {
@@ -38,8 +39,15 @@ def button_listener_thread():
 
         elif buttons["stop"].is_pressed:
             print("[BUTTON] Stop mode")
+            sentence_reader.stop()
             set_mode("stop")
 
+        elif buttons["reading"].is_pressed and sentence_reader.active:
+            # While a page is being read, the reading button skips to the next sentence
+            print("[BUTTON] Skip sentence")
+            sentence_reader.skip()
+            time.sleep(0.3)
+
         elif buttons["reading"].is_pressed:
             print("[BUTTON] Reading mode")
             set_mode("reading")
@@ -0,0 +1,119 @@
+import time
+import threading
+from collections import Counter, deque
+
+from config.settings import ANNOUNCE_QUEUE_SIZE, ANNOUNCE_LABEL_COOLDOWN, ANNOUNCE_MAX_AGE, wakeword_detected
+from utils.say_in_language import say_in_language
+
+
+def describe_objects(counts):
+    parts = [f"{count} {kind}" + ("s" if count > 1 else "") for kind, count in counts.items()]
+    sentence = ", ".join(parts[:-1]) + ", and " + parts[-1] if len(parts) > 1 else parts[0]
+    return sentence + " in front of you"
+
+
+class Announcement:
+    def __init__(self, labels, language, kind="objects", keys=None, volume=1.0):
+        self.items = list(zip(labels, keys or labels))  # (spoken label, cooldown key)
+        self.language = language
+        self.kind = kind
+        self.volume = volume
+        self.created_at = time.time()
+
+
+class AnnouncementScheduler:
+    """
+    Single speaker thread for vision announcements.
+
+    submit() only touches a small bounded queue, so the vision thread never creates threads or
+    waits on TTS. While an announcement is still pending, newer ones of the same kind are merged
+    into it by cooldown key, so an earlier track is not lost and the newest label wins. Items
+    older than max_age are dropped, and an item whose cooldown key was spoken within
+    label_cooldown seconds is left out of the next sentence. Keys default to the labels; the
+    vision service keys objects by track, so a second object with the same label, or an
+    approaching one, is still announced. The scheduler paces speech itself: it waits for the TTS
+    lock instead of being dropped by the TTS gap check, and only what actually played is
+    counted and put on cooldown.
+    """
+
+    def __init__(self, max_pending=ANNOUNCE_QUEUE_SIZE, label_cooldown=ANNOUNCE_LABEL_COOLDOWN,
+                 max_age=ANNOUNCE_MAX_AGE, speak=say_in_language):
+        self.max_pending = max_pending
+        self.label_cooldown = label_cooldown
+        self.max_age = max_age
+        self.speak = speak
+        self.counters = Counter()
+        self._pending = deque()
+        self._last_spoken = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="AnnouncementScheduler", daemon=True)
+            self._thread.start()
+
+    def submit(self, labels, language, kind="objects", keys=None, volume=1.0):
+        self.start()
+        with self._cond:
+            self.counters['submitted'] += 1
+            for pending in self._pending:
+                if pending.kind == kind and pending.language == language:
+                    # Merge by cooldown key so earlier tracks survive; the newest label wins per key
+                    merged = {key: label for label, key in pending.items}
+                    merged.update((key, label) for label, key in zip(labels, keys or labels))
+                    pending.items = [(label, key) for key, label in merged.items()]
+                    pending.volume = volume
+                    pending.created_at = time.time()
+                    self.counters['coalesced'] += 1
+                    return
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.counters['dropped_full'] += 1
+            self._pending.append(Announcement(labels, language, kind, keys, volume))
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return dict(self.counters, pending=len(self._pending))
+
+    def _next(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending)
+            return self._pending.popleft()
+
+    def _count(self, name):
+        with self._cond:
+            self.counters[name] += 1
+
+    def _run(self):
+        while True:
+            item = self._next()
+            now = time.time()
+            if now - item.created_at > self.max_age or wakeword_detected.is_set():
+                self._count('dropped_stale')
+                continue
+
+            fresh = [(label, key) for label, key in item.items
+                     if now - self._last_spoken.get(key, 0) >= self.label_cooldown]
+            if not fresh:
+                self._count('dropped_cooldown')
+                continue
+
+            labels = Counter(label for label, _ in fresh)
+            sentence = describe_objects(labels) if item.kind == "objects" else ", ".join(labels)
+            try:
+                spoken = self.speak(sentence, item.language, wait_for_completion=True, priority=1,
+                                    volume=item.volume)
+            except Exception as e:
+                print(f"[Announcer] Failed to speak '{sentence}': {e}")
+                spoken = False
+            if not spoken:
+                self._count('failed')
+                continue
+            self._count('spoken')
+            for _, key in fresh:
+                self._last_spoken[key] = time.time()
+
+
+announcer = AnnouncementScheduler()
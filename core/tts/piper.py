@@ -1,36 +1,102 @@
+import io
 import os
 import time
+import wave
 import requests
-from config.settings import tts_lock, last_play_time
+import numpy as np
+from config.settings import tts_lock, last_play_time, PIPER_VOICE, PIPER_SPEED, TTS_PREWARM_PHRASES
 from core.audio.audio_capture import play_audio_winsound
+from core.tts.tts_cache import tts_cache
+
+PIPER_URL = 'http://localhost:5000'
+
+
+def synthesize_to_bytes(text, timeout=30, voice=PIPER_VOICE, speed=PIPER_SPEED):
+    """
+    Return WAV bytes for ``text`` without playing them.
+
+    Served from the TTS cache when this text, voice and speed were synthesized before;
+    otherwise the local Piper server is asked and the result is cached.
+    """
+    audio = tts_cache.get(text, voice or "default", speed)
+    if audio is not None:
+        return audio
+
+    params = {'text': text}
+    if voice:
+        params['voice'] = voice
+    if speed != 1.0:
+        params['length_scale'] = 1.0 / speed
+    response = requests.get(PIPER_URL, params=params, timeout=timeout)
+    response.raise_for_status()
+    tts_cache.put(text, voice or "default", speed, response.content)
+    return response.content
+
+
+def prewarm_tts_cache(phrases=TTS_PREWARM_PHRASES):
+    """Make sure every fixed prompt is cached, synthesizing only the ones never seen before."""
+    start = time.time()
+    synthesized = 0
+    for phrase in phrases:
+        misses = tts_cache.counters['misses']
+        try:
+            synthesize_to_bytes(phrase)
+        except Exception as e:
+            print(f"[TTS Cache] Could not pre-warm '{phrase}': {e}")
+            continue
+        synthesized += tts_cache.counters['misses'] - misses
+    print(f"[TTS Cache] {len(phrases)} prompts ready ({synthesized} synthesized) in {time.time() - start:.1f}s")
+
+
+def scale_volume(audio, volume):
+    """Return 16-bit PCM WAV bytes with every sample scaled by ``volume`` (0-1); other formats pass through."""
+    if volume >= 1:
+        return audio
+    with wave.open(io.BytesIO(audio)) as wf:
+        params = wf.getparams()
+        frames = wf.readframes(params.nframes)
+    if params.sampwidth != 2:
+        return audio
+    samples = (np.frombuffer(frames, dtype=np.int16) * max(volume, 0.0)).astype(np.int16)
+    out = io.BytesIO()
+    with wave.open(out, 'wb') as wf:
+        wf.setparams(params)
+        wf.writeframes(samples.tobytes())
+    return out.getvalue()
 
 
 def send_text_to_tts(text, wait_for_completion=False, priority=0, volume=1):
+    """
+    Speak ``text`` through Piper and return True if it was played.
+
+    Priority 0 gives up when another clip holds the TTS lock or one finished under 1.5s ago;
+    any higher priority waits for the lock and skips the gap check. ``volume`` (0-1) scales the
+    clip itself, since winsound has no volume control.
+    """
     global last_play_time
     if not tts_lock.acquire(blocking=False):
         if not priority:
-            return
+            return False
         # high-priority: try again after a brief wait or force reset
         tts_lock.acquire()
     current_time = time.time()
 
     if priority == 0 and (current_time - last_play_time < 1.5):
         tts_lock.release()
-        return
+        return False
 
-    url = 'http://localhost:5000'
     outputFilename = 'audio_capture/output.wav'
-    payload = {'text': text}
 
     try:
-        response = requests.get(url, params=payload)
+        audio = scale_volume(synthesize_to_bytes(text), volume)
         os.makedirs(os.path.dirname(outputFilename), exist_ok=True)
         with open(outputFilename, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=128):
-                f.write(chunk)
+            f.write(audio)
         play_audio_winsound(outputFilename, wait_for_completion)
         last_play_time = time.time()
+        return True
     except Exception as e:
         print("Exception: ", e)
+        return False
     finally:
         tts_lock.release()
@@ -0,0 +1,162 @@
+import io
+import os
+import re
+import time
+import wave
+import queue
+import textwrap
+import threading
+import winsound
+
+from config.settings import tts_lock, READING_LOOKAHEAD, READING_MIN_SENTENCE_CHARS, READING_MAX_SENTENCE_CHARS
+from core.tts.piper import synthesize_to_bytes
+from twi_stuff.eng_to_twi import translate_text
+from twi_stuff.twi_tts import synthesize_speech
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+CLAUSE_END = re.compile(r'(?<=[,;:])\s+')
+PLAYBACK_FILES = 3  # rotating wav files, so the next sentence never overwrites the one playing
+
+
+def _split_long(sentence, max_chars=READING_MAX_SENTENCE_CHARS):
+    if len(sentence) <= max_chars:
+        return [sentence]
+    chunks, current = [], ""
+    for clause in CLAUSE_END.split(sentence):
+        if current and len(current) + len(clause) + 1 > max_chars:
+            chunks.append(current)
+            current = clause
+        else:
+            current = f"{current} {clause}".strip()
+    chunks = chunks + [current] if current else chunks
+    # OCR text often has no punctuation at all: cut what is still too long at the last space
+    return [piece for chunk in chunks
+            for piece in textwrap.wrap(chunk, max_chars, break_on_hyphens=False) or [chunk]]
+
+
+def split_sentences(text, min_chars=READING_MIN_SENTENCE_CHARS):
+    """
+    Split OCR text into speakable sentences.
+
+    Single line breaks are treated as OCR line wraps, fragments shorter than min_chars are
+    joined to the following sentence, and very long sentences are cut at clause boundaries.
+    """
+    text = re.sub(r'[ \t]*\n(?!\s*\n)[ \t]*', ' ', text.strip())
+    sentences, pending = [], ""
+    for piece in SENTENCE_END.split(text):
+        pending = f"{pending} {piece.strip()}".strip()
+        if len(pending) >= min_chars:
+            sentences.extend(_split_long(pending))
+            pending = ""
+    if pending:
+        sentences.append(pending)
+    return sentences
+
+
+def synthesize_sentence(sentence, language):
+    if language == 'twi':
+        path = 'audio_capture/reading_twi.wav'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not synthesize_speech(translate_text(sentence, "en-tw"), output_filename=path):
+            raise RuntimeError("Twi synthesis failed")
+        with open(path, 'rb') as f:
+            return f.read()
+    return synthesize_to_bytes(sentence)
+
+
+def wav_duration(audio):
+    with wave.open(io.BytesIO(audio)) as wf:
+        return wf.getnframes() / wf.getframerate()
+
+
+class SentenceReader:
+    """
+    Reads long text aloud one sentence at a time.
+
+    A synthesis thread renders the next sentence while the current one plays, so the wait
+    before the first word is one short sentence however long the page is. skip() cuts the
+    current sentence short and stop() ends the reading; both take effect immediately. The TTS
+    lock is only held while a sentence plays, so urgent alerts can slip in between sentences.
+    """
+
+    def __init__(self, lookahead=READING_LOOKAHEAD, synthesize=synthesize_sentence):
+        self.lookahead = lookahead
+        self.synthesize = synthesize
+        self.active = False
+        self._cancel = threading.Event()  # replaced per read(), so stopping never leaks into the next read
+        self._skip = threading.Event()
+        self._wake = threading.Event()
+
+    def stop(self):
+        self._cancel.set()
+        self._wake.set()
+
+    def skip(self):
+        self._skip.set()
+        self._wake.set()
+
+    def read(self, text, language, intro=None, outro=None):
+        """Speak ``text`` and block until it is finished or stopped. Returns False if stopped."""
+        sentences = ([intro] if intro else []) + split_sentences(text) + ([outro] if outro else [])
+        self._cancel = cancel = threading.Event()
+        self._skip.clear()
+        self._wake.clear()
+        rendered = queue.Queue(maxsize=self.lookahead)
+        threading.Thread(target=self._synthesize_all, args=(sentences, language, rendered, cancel),
+                         name="ReadingSynthesis", daemon=True).start()
+        self.active = True
+        try:
+            for index in range(len(sentences)):
+                audio = self._next(rendered, cancel)
+                if audio is None:
+                    break
+                if audio:
+                    self._play(audio, index, cancel)
+                self._skip.clear()
+                self._wake.clear()
+            return not cancel.is_set()
+        finally:
+            self.active = False
+            cancel.set()  # release this read's synthesis thread if it is still ahead of us
+
+    def _synthesize_all(self, sentences, language, rendered, cancel):
+        for sentence in sentences:
+            if cancel.is_set():
+                return
+            start = time.perf_counter()
+            try:
+                audio = self.synthesize(sentence, language)
+                print(f"[Reading] Synthesized {len(sentence)} chars in {(time.perf_counter() - start) * 1000:.0f} ms")
+            except Exception as e:
+                print(f"[Reading] Synthesis failed for '{sentence[:40]}': {e}")
+                audio = b""
+            while not cancel.is_set():
+                try:
+                    rendered.put(audio, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def _next(self, rendered, cancel):
+        while not cancel.is_set():
+            try:
+                return rendered.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _play(self, audio, index, cancel):
+        path = f'audio_capture/reading_{index % PLAYBACK_FILES}.wav'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(audio)
+        with tts_lock:
+            if self._wake.is_set():
+                return
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            if self._wake.wait(timeout=wav_duration(audio)):
+                winsound.PlaySound(None, 0)  # stop or skip: cut the sentence off now
+                print("[Reading] Stopped" if cancel.is_set() else "[Reading] Skipped sentence")
+
+
+sentence_reader = SentenceReader()
@@ -0,0 +1,131 @@
+import os
+import re
+import hashlib
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+
+from config.settings import TTS_CACHE_DIR, TTS_CACHE_MEMORY_BYTES, TTS_CACHE_DISK_BYTES
+
+
+def normalize_text(text):
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def cache_key(text, voice, speed):
+    """Content address of one utterance: the same text, voice and speed always map to the same key."""
+    return hashlib.sha256(f"{voice}\0{speed}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Two-level cache of synthesized speech.
+
+    Piper returns uncompressed PCM WAV, which is kept as-is: the most recently used clips stay
+    in memory up to memory_bytes, and every clip is written to a content-addressed file under
+    directory. The on-disk store is trimmed least-recently-used first (by file mtime, which a
+    hit refreshes) once it grows past disk_bytes.
+    """
+
+    def __init__(self, directory=TTS_CACHE_DIR, memory_bytes=TTS_CACHE_MEMORY_BYTES, disk_bytes=TTS_CACHE_DISK_BYTES):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.counters = Counter()
+        self._memory = OrderedDict()  # key -> wav bytes
+        self._memory_size = 0
+        self._disk_size = None  # computed on first write
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".wav")
+
+    def get(self, text, voice, speed):
+        key = cache_key(text, voice, speed)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                return audio
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                audio = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.counters['misses'] += 1
+            return None
+        with self._lock:
+            self.counters['disk_hits'] += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, text, voice, speed, audio):
+        key = cache_key(text, voice, speed)
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write beside the final name and rename, so a concurrent get() never sees a partial WAV
+            fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(audio)
+                os.replace(temp_path, path)
+            except OSError:
+                os.remove(temp_path)
+                raise
+        except OSError as e:
+            print(f"[TTS Cache] Could not write {path}: {e}")
+        with self._lock:
+            self._remember(key, audio)
+            if self._disk_size is None:
+                self._disk_size = sum(size for _, size, _ in self._disk_entries())
+            else:
+                self._disk_size += len(audio)
+            if self._disk_size > self.disk_bytes:
+                self._trim_disk()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, memory_entries=len(self._memory), memory_bytes=self._memory_size)
+
+    def _remember(self, key, audio):
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key))
+        self._memory[key] = audio
+        self._memory_size += len(audio)
+        while self._memory_size > self.memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _disk_entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".wav"):
+                    continue  # skip in-flight temp files
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _trim_disk(self):
+        # Drop down to 90% of the cap so the next few writes do not trigger another scan
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        self._disk_size = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._disk_size <= 0.9 * self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+                self._disk_size -= size
+                self.counters['disk_evictions'] += 1
+            except OSError:
+                pass
+
+
+tts_cache = TTSCache()
@@ -0,0 +1,204 @@
+import time
+import threading
+from contextlib import contextmanager
+
+import requests
+
+from config.settings import ESP32_CAMERA_URL, CAPTURE_LEVELS, CAPTURE_START_LEVEL, CAPTURE_BURST_LEVEL, \
+    CAPTURE_CONTROL_PERIOD, CAPTURE_LATENCY_BUDGET_MS, CAPTURE_DECODE_BUDGET_MS, CAPTURE_MIN_FPS, \
+    CAPTURE_DOWN_AFTER, CAPTURE_UP_AFTER
+from core.vision.mjpeg_stream import camera_stream, jpeg_size
+
+# ESP32 framesize index -> (width, height)
+FRAMESIZES = {
+    10: (1600, 1200), 9: (1280, 1024), 8: (1024, 768), 7: (800, 600), 6: (640, 480),
+    5: (400, 296), 4: (320, 240), 3: (240, 176), 0: (160, 120),
+}
+
+
+def set_resolution(url: str, index: int = 1, verbose: bool = False):
+    try:
+        if verbose:
+            resolutions = "10: UXGA(1600x1200)\n9: SXGA(1280x1024)\n8: XGA(1024x768)\n7: SVGA(800x600)\n6: VGA(640x480)\n5: CIF(400x296)\n4: QVGA(320x240)\n3: HQVGA(240x176)\n0: QQVGA(160x120)"
+            print("available resolutions\n{}".format(resolutions))
+
+        if index in FRAMESIZES:
+            requests.get(url + "/control?var=framesize&val={}".format(index), timeout=2)
+            return True
+        else:
+            print("Wrong index")
+    except:
+        print("SET_RESOLUTION: something went wrong")
+    return False
+
+
+def set_quality(url: str, value: int = 1, verbose: bool = False):
+    try:
+        if value >= 10 and value <= 63:
+            requests.get(url + "/control?var=quality&val={}".format(value), timeout=2)
+            return True
+    except:
+        print("SET_QUALITY: something went wrong")
+    return False
+
+
+def set_awb(url: str, awb: int = 1):
+    try:
+        awb = not awb
+        requests.get(url + "/control?var=awb&val={}".format(1 if awb else 0), timeout=2)
+    except:
+        print("SET_QUALITY: something went wrong")
+    return awb
+
+
+class CaptureController:
+    """
+    Closed-loop ESP32 framesize/JPEG-quality control.
+
+    Every CAPTURE_CONTROL_PERIOD seconds it compares vision latency, JPEG decode time and the
+    frame rate actually arriving over the link against their budgets. It steps down one level
+    in CAPTURE_LEVELS after CAPTURE_DOWN_AFTER bad periods in a row, and steps up only after
+    CAPTURE_UP_AFTER comfortable ones, so it does not oscillate. Reading and currency modes
+    can take a temporary high-resolution burst, which pauses the loop until it ends. Decisions
+    are made under a state lock; the HTTP control requests are sent afterwards by _sync(), so a
+    burst never waits on the lock behind a slow camera.
+    """
+
+    def __init__(self, camera_url=ESP32_CAMERA_URL, stream=camera_stream, levels=CAPTURE_LEVELS,
+                 start_level=CAPTURE_START_LEVEL):
+        self.camera_url = camera_url
+        self.stream = stream
+        self.levels = levels
+        self.level = start_level
+        self.latency_source = None
+        self._over = 0
+        self._under = 0
+        self._bursts = 0
+        self._burst_level = None
+        self._applied = None  # (framesize, quality) last sent to the camera
+        self._lock = threading.Lock()
+        self._apply_lock = threading.Lock()  # serializes control requests, never held with _lock
+        self._thread = None
+        self._last_frames = 0
+        self._last_time = time.time()
+
+    def apply(self, framesize, quality):
+        ok = set_resolution(self.camera_url, index=framesize)
+        ok = set_quality(self.camera_url, value=quality) and ok
+        print(f"[Capture] framesize {framesize} {FRAMESIZES.get(framesize)} quality {quality}"
+              + ("" if ok else " (control request failed)"))
+        return ok
+
+    def _sync(self):
+        """Send whatever settings are wanted now (burst or loop level) until the camera matches."""
+        with self._apply_lock:
+            while True:
+                with self._lock:
+                    desired = self._burst_level if self._bursts else self.levels[self.level]
+                if desired == self._applied:
+                    return
+                self.apply(*desired)
+                self._applied = desired
+
+    def start(self, latency_source=None):
+        self.latency_source = latency_source
+        if self._thread is None or not self._thread.is_alive():
+            self._sync()
+            self._thread = threading.Thread(target=self._run, name="CaptureController", daemon=True)
+            self._thread.start()
+
+    def _arrival_fps(self):
+        now = time.time()
+        frames = self.stream.frames_decoded + self.stream.frames_dropped
+        fps = (frames - self._last_frames) / (now - self._last_time) if now > self._last_time else 0.0
+        self._last_frames, self._last_time = frames, now
+        return fps
+
+    def step(self):
+        """Run one control decision. Returns the new level index."""
+        latency_ms = self.latency_source() if self.latency_source else 0.0
+        decode_ms = self.stream.decode_ms
+        fps = self._arrival_fps()
+
+        over = (latency_ms > CAPTURE_LATENCY_BUDGET_MS or decode_ms > CAPTURE_DECODE_BUDGET_MS
+                or fps < CAPTURE_MIN_FPS)
+        under = (latency_ms < 0.6 * CAPTURE_LATENCY_BUDGET_MS and decode_ms < 0.6 * CAPTURE_DECODE_BUDGET_MS
+                 and fps >= 1.5 * CAPTURE_MIN_FPS)
+        self._over = self._over + 1 if over else 0
+        self._under = self._under + 1 if under else 0
+
+        target = self.level
+        if self._over >= CAPTURE_DOWN_AFTER and self.level > 0:
+            target = self.level - 1
+        elif self._under >= CAPTURE_UP_AFTER and self.level < len(self.levels) - 1:
+            target = self.level + 1
+
+        if target != self.level:
+            print(f"[Capture] latency {latency_ms:.0f} ms, decode {decode_ms:.1f} ms, {fps:.1f} fps, "
+                  f"{self.stream.bandwidth_kbps:.0f} kbit/s -> level {self.level} to {target}")
+            self.level = target
+            self._over = self._under = 0
+        return self.level
+
+    def _run(self):
+        while True:
+            time.sleep(CAPTURE_CONTROL_PERIOD)
+            with self._lock:
+                if self._bursts:
+                    continue
+                try:
+                    self.step()
+                except Exception as e:
+                    print(f"[Capture] Control step failed: {e}")
+            self._sync()
+
+    @contextmanager
+    def high_resolution(self, level=CAPTURE_BURST_LEVEL, settle_timeout=2.0):
+        """Temporarily switch the camera to a high-resolution setting, restoring the loop's level after."""
+        framesize, quality = level
+        with self._lock:
+            self._bursts += 1
+            if self._bursts == 1:
+                self._burst_level = level
+        self._sync()
+        try:
+            # Wait on the JPEG a full-resolution decode would use: sensor_size is updated before
+            # the frame is decoded, latest_jpeg only once it decoded cleanly
+            deadline = time.time() + settle_timeout
+            while jpeg_size(self.stream.latest_jpeg or b"") != FRAMESIZES[framesize] and time.time() < deadline:
+                time.sleep(0.05)
+            yield
+        finally:
+            with self._lock:
+                self._bursts -= 1
+                if self._bursts == 0:
+                    self._over = self._under = 0
+            self._sync()
+
+    def capture_burst(self, frames, count, timeout=2.0, level=CAPTURE_BURST_LEVEL):
+        """
+        Grab up to ``count`` consecutive frames during one high-resolution burst.
+
+        Each new frame in the ``frames`` ring buffer is taken at full resolution from the stream,
+        falling back to the buffered copy if the stream has nothing to decode.
+        """
+        images = []
+        with self.high_resolution(level):
+            seq = frames.seq
+            deadline = time.time() + timeout
+            while len(images) < count and time.time() < deadline:
+                packet = frames.wait_for_newer(seq, timeout=max(0.0, deadline - time.time()))
+                if packet is None:
+                    break
+                seq = packet.seq
+                image = self.stream.decode_full()
+                images.append(image if image is not None else packet.image.copy())
+        return images
+
+    def capture_high_resolution(self, level=CAPTURE_BURST_LEVEL):
+        """Grab one full-resolution frame during a burst, or None if the stream has nothing yet."""
+        with self.high_resolution(level):
+            return self.stream.decode_full()
+
+
+capture_controller = CaptureController()
@@ -1,41 +1,96 @@
-import requests, cv2
 from collections import Counter
+from typing import NamedTuple
 
+import numpy as np
 
-def calculate_currency(frame, save_path='data/currency.png', url='http://localhost:8000/detect/'):
-    cv2.imwrite(save_path, frame)
+from config.load_models import models
+from config.settings import CURRENCY_MATCH_IOU, CURRENCY_MIN_PRESENCE
+from core.vision.tracker import iou_matrix
 
-    with open(save_path, 'rb') as f:
-        files = {'file': (save_path, f, 'image/png')}
-        try:
-            response = requests.post(url, files=files, timeout=10)
-            if response.status_code != 200:
-                print(f"Server returned status code {response.status_code}")
-                print(response.text)
-                return None, None
 
-            detections = response.json().get("detections", [])
-            if not detections:
-                return "No currency detected.", 0.0
+class CurrencyCount(NamedTuple):
+    summary: str
+    total: float
+    confidence: float  # 0-1 agreement of the burst on the notes counted
+    notes: list  # [(label, confidence)] per banknote
 
-            # Count occurrences of each class
-            class_counts = Counter(det["class"] for det in detections)
 
-            # Build summary string
-            summary_parts = [f"{count} x {cls}" for cls, count in class_counts.items()]
-            summary = ", ".join(summary_parts)
+class Banknote:
+    """One physical note followed across the burst, collecting score-weighted class votes."""
 
-            # Calculate total value
-            total = 0.0
-            for cls, count in class_counts.items():
-                try:
-                    value = float(cls.split()[0])  # Get the numeric part
-                    total += value * count
-                except ValueError:
-                    print(f"Could not parse currency value from class: {cls}")
+    def __init__(self, box, label, score):
+        self.box = box
+        self.votes = Counter({label: score})
+        self.seen = 1
 
-            return summary, total
+    def add(self, box, label, score):
+        self.box = self.box + (box - self.box) / (self.seen + 1)
+        self.votes[label] += score
+        self.seen += 1
 
-        except requests.exceptions.RequestException as e:
-            print(f"Request error: {e}")
-            return None, None
+
+def denomination(label):
+    try:
+        return float(label.split()[0])  # class names look like "10 cedis"
+    except (ValueError, IndexError):
+        print(f"[Currency] Could not parse currency value from class: {label}")
+        return 0.0
+
+
+def vote_banknotes(batch, frames, names, match_iou=CURRENCY_MATCH_IOU, min_presence=CURRENCY_MIN_PRESENCE):
+    """
+    Vote per banknote over the detections of a burst.
+
+    Boxes are normalized by frame size (bursts can mix resolutions) and greedily matched by IoU
+    to the notes seen so far. A note counts if it shows up in at least min_presence of the
+    frames; its label is the class with the highest summed score, and its confidence is that
+    summed score over the number of frames.
+    """
+    notes = []
+    for detections, frame in zip(batch, frames):
+        if not len(detections):
+            continue
+        height, width = frame.shape[:2]
+        boxes = detections['box'] / np.array([width, height, width, height], dtype=np.float32)
+        labels = [names[int(class_id)] for class_id in detections['class_id']]
+        matched_detections, matched_notes = set(), set()
+        if notes:
+            iou = iou_matrix(boxes, np.stack([note.box for note in notes]))
+            for d, n in zip(*np.unravel_index(np.argsort(-iou, axis=None), iou.shape)):
+                if iou[d, n] < match_iou:
+                    break
+                if d in matched_detections or n in matched_notes:
+                    continue
+                notes[n].add(boxes[d], labels[d], float(detections['score'][d]))
+                matched_detections.add(d)
+                matched_notes.add(n)
+        for d in range(len(detections)):
+            if d not in matched_detections:
+                notes.append(Banknote(boxes[d], labels[d], float(detections['score'][d])))
+
+    kept = []
+    for note in notes:
+        if note.seen / len(frames) >= min_presence:
+            label, score = note.votes.most_common(1)[0]
+            kept.append((label, min(1.0, score / len(frames))))
+    return kept
+
+
+def calculate_currency(frames):
+    """Count banknotes over a burst of frames with the in-process currency detector."""
+    frames = list(frames)
+    if not frames:
+        return CurrencyCount("No currency detected.", 0.0, 0.0, [])
+    detector = models.get('currency')
+    batch = detector.detect(frames)
+    notes = vote_banknotes(batch, frames, detector.names)
+    if not notes:
+        empty_share = sum(1 for detections in batch if not len(detections)) / len(frames)
+        return CurrencyCount("No currency detected.", 0.0, empty_share, [])
+
+    class_counts = Counter(label for label, _ in notes)
+    summary = ", ".join(f"{count} x {label}" for label, count in class_counts.items())
+    total = sum(denomination(label) * count for label, count in class_counts.items())
+    confidence = float(np.mean([confidence for _, confidence in notes]))
+    print(f"[Currency] {summary} = {total} over {len(frames)} frames (confidence {confidence:.2f})")
+    return CurrencyCount(summary, total, confidence, notes)
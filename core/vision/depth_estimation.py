@@ -1,4 +1,51 @@
 import cv2
+import numpy as np
+
+DEPTH_INPUT_SIZE = (256, 256)
+
+
+class DepthMap:
+    """
+    MiDaS output kept at the network's native resolution.
+
+    Bounding boxes from the detector are in frame coordinates; map_boxes() scales them into
+    depth-map coordinates so per-box queries touch the small map instead of a full-frame
+    upsampled copy. The JET visualization is only built when something asks for it.
+    """
+
+    def __init__(self, raw, frame_shape):
+        self.raw = raw
+        self.frame_height, self.frame_width = frame_shape[:2]
+        self.height, self.width = raw.shape[:2]
+        self.scale_x = self.width / self.frame_width
+        self.scale_y = self.height / self.frame_height
+        self._vis = None
+
+    def map_boxes(self, boxes):
+        """Map (N, 4) x1, y1, x2, y2 frame boxes to non-empty int32 boxes in depth-map coordinates."""
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        scale = np.array([self.scale_x, self.scale_y, self.scale_x, self.scale_y], dtype=np.float32)
+        mapped = boxes * scale
+        mapped[:, :2] = np.floor(mapped[:, :2])
+        mapped[:, 2:] = np.ceil(mapped[:, 2:])
+        mapped[:, [0, 2]] = np.clip(mapped[:, [0, 2]], 0, self.width)
+        mapped[:, [1, 3]] = np.clip(mapped[:, [1, 3]], 0, self.height)
+        mapped = mapped.astype(np.int32)
+        # Tiny boxes can collapse after scaling; keep at least one depth pixel
+        mapped[:, 2] = np.maximum(mapped[:, 2], np.minimum(mapped[:, 0] + 1, self.width))
+        mapped[:, 3] = np.maximum(mapped[:, 3], np.minimum(mapped[:, 1] + 1, self.height))
+        mapped[:, 0] = np.minimum(mapped[:, 0], mapped[:, 2] - 1)
+        mapped[:, 1] = np.minimum(mapped[:, 1], mapped[:, 3] - 1)
+        return mapped
+
+    def colorize(self, size=None):
+        """JET visualization for a display, optionally resized to ``size`` (width, height)."""
+        if self._vis is None:
+            norm_depth = cv2.normalize(self.raw, None, 255, 0, cv2.NORM_MINMAX, cv2.CV_8U)
+            self._vis = cv2.applyColorMap(norm_depth, cv2.COLORMAP_JET)
+        if size is not None and (self._vis.shape[1], self._vis.shape[0]) != tuple(size):
+            return cv2.resize(self._vis, tuple(size))
+        return self._vis
 
 
 def load_depth_model(path="./models/Midas-V2.onnx"):
@@ -9,12 +56,7 @@ def load_depth_model(path="./models/Midas-V2.onnx"):
 
 
 def run_depth_estimation(frame, net):
-    input_size = (256, 256)
-    blob = cv2.dnn.blobFromImage(frame, 1 / 255.0, input_size, (0, 0, 0), swapRB=True, crop=False)
+    blob = cv2.dnn.blobFromImage(frame, 1 / 255.0, DEPTH_INPUT_SIZE, (0, 0, 0), swapRB=True, crop=False)
     net.setInput(blob)
     output = net.forward()
-    depth = output.squeeze()
-    depth = cv2.resize(depth, (frame.shape[1], frame.shape[0]))
-    norm_depth = cv2.normalize(depth, None, 255, 0, cv2.NORM_MINMAX, cv2.CV_8U)
-    color_depth = cv2.applyColorMap(norm_depth, cv2.COLORMAP_JET)
-    return color_depth, depth
+    return DepthMap(output.squeeze(), frame.shape)
@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+
+from config.settings import DEPTH_FLOW_SIZE, DEPTH_FLOW_INTERVAL, DEPTH_FLOW_MAX_ERROR, DEPTH_FLOW_MIN_CONFIDENCE
+from core.vision.depth_estimation import DepthMap
+from core.vision.depth_worker import DepthResult
+from core.vision.motion_gate import scene_thumbnail
+
+
+def flow_gray(frame, size=DEPTH_FLOW_SIZE):
+    """Downsampled 8-bit grayscale frame used for optical flow."""
+    return scene_thumbnail(frame, size).astype(np.uint8)
+
+
+class DepthPropagator:
+    """
+    Carries the last MiDaS depth map forward to the current frame with optical flow.
+
+    Dense Farneback flow is computed at DEPTH_FLOW_SIZE between consecutive flow updates and
+    chained into one current-frame -> keyframe pixel map, so small per-step motions add up
+    to drifts a single flow pass could not follow. The depth map is remapped along that map.
+    The keyframe warped by the same map is compared with the current frame; that photometric
+    error and the share of pixels whose source falls outside the keyframe give a 0-1
+    confidence. Below min_confidence the caller should ask for a real depth pass.
+    """
+
+    def __init__(self, interval=DEPTH_FLOW_INTERVAL, max_error=DEPTH_FLOW_MAX_ERROR,
+                 min_confidence=DEPTH_FLOW_MIN_CONFIDENCE):
+        self.interval = interval
+        self.max_error = max_error
+        self.min_confidence = min_confidence
+        self.confidence = 1.0
+        self._key = None
+        self._current = None
+        self._last_run = 0.0
+        self._grid = None
+        self._map = None  # (map_x, map_y): where each current flow-resolution pixel sits in the keyframe
+        self._prev_gray = None
+
+    @property
+    def needs_refresh(self):
+        return self.confidence < self.min_confidence
+
+    def _pixel_grid(self, shape):
+        if self._grid is None or self._grid[0].shape != shape:
+            height, width = shape
+            self._grid = np.meshgrid(np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32))
+        return self._grid
+
+    def propagate(self, depth, frame, now):
+        """Return a DepthResult aligned to ``frame``; at most one flow pass per interval."""
+        if depth is not self._key:
+            self._key = depth
+            self._current = depth
+            self.confidence = 1.0
+            self._last_run = 0.0
+            self._map = None
+            self._prev_gray = depth.gray
+        if depth.gray is None or now - self._last_run < self.interval:
+            return self._current
+        self._last_run = now
+
+        gray = flow_gray(frame)
+        # Flow from the current frame into the previous one: where each current pixel came from
+        flow = cv2.calcOpticalFlowFarneback(gray, self._prev_gray, None, 0.5, 3, 15, 3, 5, 1.2, 0)
+        grid_x, grid_y = self._pixel_grid(gray.shape)
+        map_x, map_y = grid_x + flow[..., 0], grid_y + flow[..., 1]
+        if self._map is not None:
+            # Compose with the previous frame's map into the keyframe
+            map_x, map_y = (cv2.remap(previous, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+                            for previous in self._map)
+        self._map = (map_x, map_y)
+        self._prev_gray = gray
+
+        height, width = gray.shape
+        warped_key = cv2.remap(depth.gray, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+        error = float(np.mean(cv2.absdiff(warped_key, gray))) / 255.0
+        outside = float(np.mean((map_x < 0) | (map_x > width - 1) | (map_y < 0) | (map_y > height - 1)))
+        self.confidence = max(0.0, 1.0 - error / self.max_error) * (1.0 - outside)
+
+        depth_map = depth.depth_map
+        size = (depth_map.width, depth_map.height)
+        depth_x = cv2.resize(map_x * (depth_map.width / width), size, interpolation=cv2.INTER_LINEAR)
+        depth_y = cv2.resize(map_y * (depth_map.height / height), size, interpolation=cv2.INTER_LINEAR)
+        warped = cv2.remap(depth_map.raw, depth_x, depth_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+        self._current = DepthResult(DepthMap(warped, frame.shape), depth.seq, now, depth.gray)
+        return self._current
@@ -0,0 +1,142 @@
+import time
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from config.load_models import models
+from config.settings import DEPTH_INTERVAL, DEPTH_MIN_INTERVAL, DEPTH_MOTION_FULL_RATE, DEPTH_FLOW_SIZE
+from core.vision.depth_estimation import DepthMap, run_depth_estimation
+from core.vision.frame_buffer import camera_frames
+from core.vision.motion_gate import scene_thumbnail, thumbnail_difference
+
+POLL_INTERVAL = 0.1  # seconds between scene-change samples while waiting for the next pass
+
+
+class DepthResult(NamedTuple):
+    depth_map: DepthMap
+    seq: int
+    timestamp: float
+    gray: np.ndarray = None  # DEPTH_FLOW_SIZE grayscale of the source frame, for flow propagation
+
+    @property
+    def age(self):
+        return time.time() - self.timestamp
+
+
+class DepthWorker:
+    """
+    Runs depth estimation on its own thread so the detection loop never waits on MiDaS.
+
+    Each pass takes the newest frame from the frame buffer. Between passes the worker samples a
+    tiny grayscale thumbnail to measure how fast the scene is changing and shortens the refresh
+    interval from DEPTH_INTERVAL down to DEPTH_MIN_INTERVAL as the change rate rises. With
+    adaptive=False the interval stays at DEPTH_INTERVAL and extra passes only come from
+    request_refresh(), which is how the flow propagation stage drives it.
+    """
+
+    def __init__(self, net=None, frames=camera_frames, base_interval=DEPTH_INTERVAL, min_interval=DEPTH_MIN_INTERVAL,
+                 adaptive=True):
+        self._net = net
+        self.frames = frames
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.adaptive = adaptive
+        self.interval = base_interval
+        self.scene_change = 0.0
+        self._result = None
+        self._lock = threading.Lock()
+        self._refresh = threading.Event()
+        self._active = threading.Event()
+        self._shutdown = threading.Event()
+        self._thread = None
+        self._prev_thumb = None
+        self._thumb_seq = 0
+
+    @property
+    def net(self):
+        # MiDaS loads on the first depth pass (or earlier via the boot preload), not at import
+        if self._net is None:
+            self._net = models.get('midas')
+        return self._net
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._shutdown.clear()
+            self._thread = threading.Thread(target=self._run, name="DepthWorker", daemon=True)
+            self._thread.start()
+
+    def shutdown(self):
+        self._shutdown.set()
+        self._active.set()
+        self._refresh.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def pause(self):
+        self._active.clear()
+
+    def resume(self):
+        self._active.set()
+
+    def request_refresh(self):
+        """Run the next depth pass as soon as possible instead of waiting for the interval."""
+        self._refresh.set()
+
+    def latest(self):
+        """Return the newest DepthResult (check ``.age`` for staleness), or None before the first pass."""
+        with self._lock:
+            return self._result
+
+    def _sample_scene_change(self):
+        if not self.adaptive:
+            return
+        packet = self.frames.latest()
+        if packet is None or packet.seq == self._thumb_seq:
+            return
+        thumb = scene_thumbnail(packet.image)
+        if self._prev_thumb is not None:
+            change = thumbnail_difference(thumb, self._prev_thumb)
+            self.scene_change = 0.7 * self.scene_change + 0.3 * change
+        self._prev_thumb = thumb
+        self._thumb_seq = packet.seq
+
+        # Linearly shorten the refresh interval as the scene changes faster
+        ratio = min(1.0, self.scene_change / DEPTH_MOTION_FULL_RATE)
+        self.interval = self.base_interval - (self.base_interval - self.min_interval) * ratio
+
+    def _run(self):
+        last_pass = 0.0
+        while not self._shutdown.is_set():
+            if not self._active.wait(timeout=0.5):
+                continue
+
+            self._sample_scene_change()
+            due = self._result is None or time.time() - last_pass >= self.interval
+            if not due and not self._refresh.wait(timeout=POLL_INTERVAL):
+                continue
+            self._refresh.clear()
+            if self._shutdown.is_set():
+                break
+
+            packet = self.frames.latest()
+            if packet is None:
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            try:
+                start = time.time()
+                # Private copy: the ring-buffer slot can be recycled during the MiDaS pass, and the
+                # flow keyframe must come from the same pixels as the depth map
+                image = packet.image.copy()
+                gray = scene_thumbnail(image, DEPTH_FLOW_SIZE).astype(np.uint8)
+                depth_map = run_depth_estimation(image, self.net)
+                last_pass = time.time()
+                with self._lock:
+                    self._result = DepthResult(depth_map, packet.seq, packet.timestamp, gray)
+                print(f"[Depth] New depth map for frame {packet.seq} in {(last_pass - start) * 1000:.0f} ms "
+                      f"(next in {self.interval:.1f}s, scene change {self.scene_change:.3f})")
+            except Exception as e:
+                print(f"[Depth] Depth estimation failed: {e}")
+                time.sleep(POLL_INTERVAL)
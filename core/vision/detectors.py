@@ -0,0 +1,232 @@
+import ast
+
+import cv2
+import numpy as np
+
+from config.settings import DETECTOR_BACKEND, DETECTOR_MODELS, DETECTOR_INPUT_SIZE, DETECTOR_THREADS, \
+    DETECTOR_GRAPH_OPTIMIZATION, DETECTOR_CONF_THRESHOLD, DETECTOR_IOU_THRESHOLD
+
+# One row per detection; every backend returns one of these arrays per input frame
+DETECTION_DTYPE = np.dtype([
+    ('box', np.float32, (4,)),  # x1, y1, x2, y2 in frame pixels
+    ('score', np.float32),
+    ('class_id', np.int32),
+])
+
+COCO_NAMES = [
+    'person', 'bicycle', 'car', 'motorcycle', 'airplane', 'bus', 'train', 'truck', 'boat', 'traffic light',
+    'fire hydrant', 'stop sign', 'parking meter', 'bench', 'bird', 'cat', 'dog', 'horse', 'sheep', 'cow',
+    'elephant', 'bear', 'zebra', 'giraffe', 'backpack', 'umbrella', 'handbag', 'tie', 'suitcase', 'frisbee',
+    'skis', 'snowboard', 'sports ball', 'kite', 'baseball bat', 'baseball glove', 'skateboard', 'surfboard',
+    'tennis racket', 'bottle', 'wine glass', 'cup', 'fork', 'knife', 'spoon', 'bowl', 'banana', 'apple',
+    'sandwich', 'orange', 'broccoli', 'carrot', 'hot dog', 'pizza', 'donut', 'cake', 'chair', 'couch',
+    'potted plant', 'bed', 'dining table', 'toilet', 'tv', 'laptop', 'mouse', 'remote', 'keyboard', 'cell phone',
+    'microwave', 'oven', 'toaster', 'sink', 'refrigerator', 'book', 'clock', 'vase', 'scissors', 'teddy bear',
+    'hair drier', 'toothbrush',
+]
+
+_BACKENDS = {}
+
+
+def register_backend(name):
+    """Class decorator adding a detector backend under ``name`` (the value used in DETECTOR_BACKEND)."""
+    def decorator(cls):
+        _BACKENDS[name] = cls
+        cls.backend_name = name
+        return cls
+    return decorator
+
+
+def available_backends():
+    return sorted(_BACKENDS)
+
+
+def create_detector(backend=DETECTOR_BACKEND, model_path=None, **options):
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown detector backend '{backend}'. Available: {', '.join(available_backends())}")
+    return _BACKENDS[backend](model_path or DETECTOR_MODELS[backend], **options)
+
+
+def metadata_names(session):
+    """Class names an ultralytics ONNX export stores in its metadata, or None."""
+    names = session.get_modelmeta().custom_metadata_map.get('names')
+    return ast.literal_eval(names) if names else None
+
+
+def empty_detections():
+    return np.zeros(0, dtype=DETECTION_DTYPE)
+
+
+class DetectorBackend:
+    """
+    Common interface for object detectors.
+
+    ``detect(frames)`` takes a list of BGR frames and returns one DETECTION_DTYPE array per
+    frame. ``names`` maps class IDs to labels, like ultralytics' ``model.names``.
+    """
+
+    backend_name = None
+
+    def __init__(self, model_path, input_size=DETECTOR_INPUT_SIZE, threads=DETECTOR_THREADS,
+                 conf_threshold=DETECTOR_CONF_THRESHOLD, iou_threshold=DETECTOR_IOU_THRESHOLD):
+        self.model_path = model_path
+        self.input_size = input_size
+        self.threads = threads
+        self.conf_threshold = conf_threshold
+        self.iou_threshold = iou_threshold
+        self.names = dict(enumerate(COCO_NAMES))
+
+    def detect(self, frames):
+        raise NotImplementedError
+
+    def __call__(self, frames):
+        return self.detect(frames)
+
+
+def letterbox(frame, size):
+    """Resize keeping aspect ratio and pad to a size x size square. Returns image, scale and padding."""
+    height, width = frame.shape[:2]
+    scale = min(size / height, size / width)
+    new_w, new_h = int(round(width * scale)), int(round(height * scale))
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    return canvas, scale, (pad_x, pad_y)
+
+
+def decode_yolov5(prediction, scale, pad, frame_shape, conf_threshold, iou_threshold):
+    """Turn one (num_anchors, 5 + classes) YOLOv5 output into a DETECTION_DTYPE array in frame pixels."""
+    class_scores = prediction[:, 5:] * prediction[:, 4:5]
+    class_ids = class_scores.argmax(axis=1)
+    scores = class_scores[np.arange(len(class_ids)), class_ids]
+    keep = scores >= conf_threshold
+    if not keep.any():
+        return empty_detections()
+
+    xywh = prediction[keep, :4]
+    scores, class_ids = scores[keep], class_ids[keep]
+    boxes = np.empty_like(xywh)
+    boxes[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+    boxes[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+    boxes -= np.array([pad[0], pad[1], pad[0], pad[1]], dtype=np.float32)
+    boxes /= scale
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, frame_shape[1])
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, frame_shape[0])
+
+    # Class-aware NMS: offset each class into its own coordinate range
+    offsets = class_ids[:, None].astype(np.float32) * 4096
+    nms_boxes = boxes + offsets
+    nms_xywh = np.concatenate([nms_boxes[:, :2], nms_boxes[:, 2:] - nms_boxes[:, :2]], axis=1)
+    indices = np.asarray(cv2.dnn.NMSBoxes(nms_xywh.tolist(), scores.tolist(), conf_threshold, iou_threshold),
+                         dtype=np.int64).reshape(-1)
+
+    detections = np.zeros(len(indices), dtype=DETECTION_DTYPE)
+    detections['box'] = boxes[indices]
+    detections['score'] = scores[indices]
+    detections['class_id'] = class_ids[indices]
+    return detections
+
+
+@register_backend("pytorch")
+class UltralyticsBackend(DetectorBackend):
+    def __init__(self, model_path, **options):
+        super().__init__(model_path, **options)
+        import torch
+        from ultralytics import YOLO
+
+        torch.set_num_threads(self.threads)
+        self.model = YOLO(model_path)
+        self.names = self.model.names
+
+    def detect(self, frames):
+        results = self.model(list(frames), imgsz=self.input_size, conf=self.conf_threshold,
+                             iou=self.iou_threshold, verbose=False)
+        batch = []
+        for r in results:
+            data = r.boxes.data.cpu().numpy()
+            detections = np.zeros(len(data), dtype=DETECTION_DTYPE)
+            detections['box'] = data[:, :4]
+            detections['score'] = data[:, 4]
+            detections['class_id'] = data[:, 5]
+            batch.append(detections)
+        return batch
+
+
+@register_backend("onnxruntime")
+class OnnxRuntimeBackend(DetectorBackend):
+    GRAPH_OPTIMIZATION_LEVELS = {
+        'disable': 'ORT_DISABLE_ALL',
+        'basic': 'ORT_ENABLE_BASIC',
+        'extended': 'ORT_ENABLE_EXTENDED',
+        'all': 'ORT_ENABLE_ALL',
+    }
+
+    def __init__(self, model_path, graph_optimization=DETECTOR_GRAPH_OPTIMIZATION, **options):
+        super().__init__(model_path, **options)
+        import onnxruntime as ort
+
+        session_options = ort.SessionOptions()
+        session_options.intra_op_num_threads = self.threads
+        session_options.inter_op_num_threads = 1
+        session_options.graph_optimization_level = getattr(
+            ort.GraphOptimizationLevel, self.GRAPH_OPTIMIZATION_LEVELS[graph_optimization])
+        self.session = ort.InferenceSession(model_path, session_options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Exported models with a fixed batch dimension have to be run one frame at a time
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+
+        self.names = metadata_names(self.session) or self.names
+
+    def _run(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+    def detect(self, frames):
+        frames = list(frames)
+        if not frames:
+            return []
+        boxed = [letterbox(frame, self.input_size) for frame in frames]
+        blob = cv2.dnn.blobFromImages([image for image, _, _ in boxed], 1 / 255.0, swapRB=True)
+        if self.dynamic_batch:
+            outputs = self._run(blob)
+        else:
+            outputs = np.concatenate([self._run(blob[i:i + 1]) for i in range(len(frames))])
+        return [decode_yolov5(output, scale, pad, frame.shape, self.conf_threshold, self.iou_threshold)
+                for output, (_, scale, pad), frame in zip(outputs, boxed, frames)]
+
+
+@register_backend("opencv")
+class OpenCVDnnBackend(DetectorBackend):
+    def __init__(self, model_path, **options):
+        super().__init__(model_path, **options)
+        cv2.setNumThreads(self.threads)
+        self.net = cv2.dnn.readNetFromONNX(model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self.names = self._load_names(model_path)
+
+    def _load_names(self, model_path):
+        # cv2.dnn drops the ONNX metadata, so read it through onnxruntime when that is installed
+        try:
+            import onnxruntime as ort
+            names = metadata_names(ort.InferenceSession(model_path, providers=["CPUExecutionProvider"]))
+        except ImportError:
+            names = None
+        if names:
+            return names
+        # Without metadata only a COCO model can be labelled; anything else would be mislabelled
+        self.net.setInput(np.zeros((1, 3, self.input_size, self.input_size), dtype=np.float32))
+        num_classes = self.net.forward().shape[-1] - 5
+        if num_classes != len(COCO_NAMES):
+            raise ValueError(f"{model_path} has {num_classes} classes but no class names in its metadata; "
+                             f"install onnxruntime or export it with ultralytics")
+        return self.names
+
+    def detect(self, frames):
+        results = []
+        for frame in frames:
+            image, scale, pad = letterbox(frame, self.input_size)
+            self.net.setInput(cv2.dnn.blobFromImage(image, 1 / 255.0, swapRB=True))
+            output = self.net.forward()
+            results.append(decode_yolov5(output[0], scale, pad, frame.shape, self.conf_threshold, self.iou_threshold))
+        return results
@@ -0,0 +1,82 @@
+import time
+import threading
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+from config.settings import FRAME_SIZE, FRAME_BUFFER_SLOTS
+
+
+class BufferedFrame(NamedTuple):
+    seq: int
+    timestamp: float
+    image: np.ndarray
+
+
+class FrameRingBuffer:
+    """
+    Ring of preallocated frame slots shared by the camera thread and every frame consumer.
+
+    Each published frame gets a monotonically increasing sequence number and its capture
+    timestamp. Readers receive views into the slots rather than copies, so a consumer that
+    keeps a frame around for longer than a few publishes should use ``snapshot()`` or copy it.
+    """
+
+    def __init__(self, slots=FRAME_BUFFER_SLOTS, size=FRAME_SIZE):
+        width, height = size
+        self.slots = slots
+        self.size = size
+        self._frames = np.zeros((slots, height, width, 3), dtype=np.uint8)
+        self._timestamps = np.zeros(slots, dtype=np.float64)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def publish(self, frame, timestamp=None):
+        """Copy (and resize if needed) a decoded frame into the next slot. Single producer only."""
+        seq = self._seq + 1
+        index = seq % self.slots
+        slot = self._frames[index]
+        if frame.shape == slot.shape:
+            np.copyto(slot, frame)
+        else:
+            cv2.resize(frame, self.size, dst=slot)
+
+        with self._cond:
+            self._timestamps[index] = time.time() if timestamp is None else timestamp
+            self._seq = seq
+            self._cond.notify_all()
+        return seq
+
+    def _packet(self, seq):
+        index = seq % self.slots
+        return BufferedFrame(seq, float(self._timestamps[index]), self._frames[index])
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def latest(self):
+        """Return the newest frame, or None if nothing has been published yet."""
+        with self._cond:
+            if self._seq == 0:
+                return None
+            return self._packet(self._seq)
+
+    def wait_for_newer(self, after_seq, timeout=None):
+        """Block until a frame newer than ``after_seq`` exists and return it, or None on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > after_seq, timeout):
+                return None
+            return self._packet(self._seq)
+
+    def snapshot(self):
+        """Return a private copy of the newest frame, or None if nothing has been published yet."""
+        packet = self.latest()
+        if packet is None:
+            return None
+        return BufferedFrame(packet.seq, packet.timestamp, packet.image.copy())
+
+
+# Shared buffer fed by the ESP32 camera thread
+camera_frames = FrameRingBuffer()
@@ -0,0 +1,56 @@
+import time
+from typing import NamedTuple
+
+import cv2
+
+from config.settings import UPLOAD_MAX_BYTES, UPLOAD_JPEG_QUALITIES, UPLOAD_MIN_SIDE
+
+
+class ImagePayload(NamedTuple):
+    data: bytes
+    width: int
+    height: int
+    quality: int
+    encode_ms: float
+    filename: str = "image.jpg"
+    content_type: str = "image/jpeg"
+
+    def as_upload(self):
+        """(filename, bytes, content type) tuple for a ``requests`` files= field."""
+        return self.filename, self.data, self.content_type
+
+
+def build_jpeg_payload(image, max_bytes=UPLOAD_MAX_BYTES, qualities=UPLOAD_JPEG_QUALITIES,
+                       min_side=UPLOAD_MIN_SIDE, tag="Upload"):
+    """
+    Encode a BGR image to JPEG in memory, staying under ``max_bytes``.
+
+    Qualities are tried from best to worst; if even the lowest one is over budget the image is
+    downscaled (by the square root of the overshoot, since JPEG size tracks pixel count) and
+    tried again, down to ``min_side`` on the shorter edge. The smallest encoding is returned
+    if nothing fits.
+    """
+    start = time.perf_counter()
+    encodes = 0
+    best = None
+    while True:
+        height, width = image.shape[:2]
+        for quality in qualities:
+            ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            encodes += 1
+            if not ok:
+                raise ValueError("JPEG encoding failed")
+            if best is None or encoded.nbytes < best[0].nbytes:
+                best = (encoded, width, height, quality)
+            if encoded.nbytes <= max_bytes:
+                break
+        if best[0].nbytes <= max_bytes or min(height, width) <= min_side:
+            break
+        scale = max(min_side / min(height, width), 0.9 * (max_bytes / best[0].nbytes) ** 0.5)
+        image = cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+    encoded, width, height, quality = best
+    encode_ms = (time.perf_counter() - start) * 1000
+    print(f"[{tag}] JPEG {width}x{height} q{quality}: {encoded.nbytes / 1024:.0f} KB "
+          f"in {encode_ms:.1f} ms ({encodes} encode{'s' if encodes > 1 else ''})")
+    return ImagePayload(encoded.tobytes(), width, height, quality, encode_ms)
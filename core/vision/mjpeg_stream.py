@@ -0,0 +1,218 @@
+import re
+import time
+import select
+import socket
+from urllib.parse import urlparse
+
+import cv2
+import numpy as np
+
+from config.settings import FRAME_SIZE, ESP32_STREAM_URL
+
+SOI = b"\xff\xd8"
+EOI = b"\xff\xd9"
+RECV_SIZE = 65536
+REPORT_EVERY = 300  # decoded frames between stats log lines
+SOF_MARKERS = {0xC0, 0xC1, 0xC2}
+
+
+def jpeg_size(jpeg):
+    """(width, height) from a JPEG's SOF header without decoding it, or None if not found."""
+    index = 2
+    while index + 9 < len(jpeg):
+        if jpeg[index] != 0xFF:
+            return None
+        marker = jpeg[index + 1]
+        if marker in SOF_MARKERS:
+            height = int.from_bytes(jpeg[index + 5:index + 7], "big")
+            width = int.from_bytes(jpeg[index + 7:index + 9], "big")
+            return width, height
+        index += 2 + int.from_bytes(jpeg[index + 2:index + 4], "big")
+    return None
+
+
+class MJPEGStreamReader:
+    """
+    Minimal multipart/x-mixed-replace client for the ESP32 camera stream.
+
+    Unlike cv2.VideoCapture it drains everything already sitting in the socket before decoding,
+    so only the newest complete JPEG is decoded and older ones are counted as dropped. When the
+    sensor frame is at least 2x or 4x the target size, it decodes with IMREAD_REDUCED_COLOR_2/4
+    so the JPEG decoder does the downscaling; the sensor size is read from each JPEG header,
+    so resolution changes on the camera are picked up immediately. The raw bytes of the newest JPEG are kept for
+    callers that want the full-resolution image or want to upload it without re-encoding.
+    """
+
+    def __init__(self, url, target_size=FRAME_SIZE, timeout=5.0):
+        self.url = url
+        self.target_size = target_size
+        self.timeout = timeout
+        self.sensor_size = None
+        self.latest_jpeg = None
+        self.frames_decoded = 0
+        self.frames_dropped = 0
+        self.bytes_received = 0
+        self.decode_ms = 0.0  # moving average
+        self._sock = None
+        self._buffer = bytearray()
+        self._boundary = None
+        self._started = time.time()
+
+    def open(self):
+        parsed = urlparse(self.url)
+        host, port = parsed.hostname, parsed.port or 80
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+
+        self._sock = socket.create_connection((host, port), timeout=self.timeout)
+        self._sock.sendall(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode())
+
+        header = bytearray()
+        while b"\r\n\r\n" not in header:
+            chunk = self._sock.recv(4096)
+            if not chunk:
+                raise ConnectionError(f"Stream closed before headers: {self.url}")
+            header.extend(chunk)
+        head, _, rest = bytes(header).partition(b"\r\n\r\n")
+        status = head.split(b"\r\n", 1)[0]
+        if b" 200" not in status:
+            raise ConnectionError(f"Unexpected stream response: {status.decode(errors='ignore')}")
+
+        match = re.search(rb"boundary=\"?([^\";\r\n]+)", head, re.IGNORECASE)
+        self._boundary = b"--" + match.group(1).lstrip(b"-") if match else None
+        self._buffer = bytearray(rest)
+        self._started = time.time()
+        return self
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+    def _fill(self):
+        """Block for at least one chunk, then drain whatever else is already queued on the socket."""
+        chunk = self._sock.recv(RECV_SIZE)
+        if not chunk:
+            raise ConnectionError("Stream closed")
+        self._buffer.extend(chunk)
+        self.bytes_received += len(chunk)
+        while select.select([self._sock], [], [], 0)[0]:
+            chunk = self._sock.recv(RECV_SIZE)
+            if not chunk:
+                break
+            self._buffer.extend(chunk)
+            self.bytes_received += len(chunk)
+
+    def _extract_parts(self):
+        """Pop every complete multipart body out of the buffer, oldest first."""
+        jpegs = []
+        while True:
+            start = self._buffer.find(self._boundary)
+            if start < 0:
+                return jpegs
+            header_end = self._buffer.find(b"\r\n\r\n", start)
+            if header_end < 0:
+                del self._buffer[:start]
+                return jpegs
+            body = header_end + 4
+            length = re.search(rb"Content-Length:\s*(\d+)", self._buffer[start:header_end], re.IGNORECASE)
+            if length:
+                end = body + int(length.group(1))
+                if len(self._buffer) < end:
+                    del self._buffer[:start]
+                    return jpegs
+            else:
+                end = self._buffer.find(EOI, body)
+                if end < 0:
+                    del self._buffer[:start]
+                    return jpegs
+                end += 2
+            jpegs.append(bytes(self._buffer[body:end]))
+            del self._buffer[:end]
+
+    def _extract_jpegs(self):
+        """Pop every complete JPEG out of the buffer, oldest first."""
+        if self._boundary:
+            return self._extract_parts()
+        # No boundary announced: fall back to scanning for JPEG start/end markers
+        jpegs = []
+        while True:
+            start = self._buffer.find(SOI)
+            if start < 0:
+                # Keep a tail in case a marker straddles the chunk boundary
+                del self._buffer[:max(0, len(self._buffer) - 1)]
+                return jpegs
+            end = self._buffer.find(EOI, start + 2)
+            if end < 0:
+                del self._buffer[:start]
+                return jpegs
+            jpegs.append(bytes(self._buffer[start:end + 2]))
+            del self._buffer[:end + 2]
+
+    def _reduced_flag(self):
+        if self.sensor_size is None:
+            return cv2.IMREAD_COLOR
+        ratio = min(self.sensor_size[0] / self.target_size[0], self.sensor_size[1] / self.target_size[1])
+        if ratio >= 4:
+            return cv2.IMREAD_REDUCED_COLOR_4
+        if ratio >= 2:
+            return cv2.IMREAD_REDUCED_COLOR_2
+        return cv2.IMREAD_COLOR
+
+    def decode_full(self, jpeg=None):
+        """Full-resolution decode of ``jpeg`` (default: newest received), e.g. for OCR bursts."""
+        jpeg = self.latest_jpeg if jpeg is None else jpeg
+        if jpeg is None:
+            return None
+        return cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def read_jpegs(self):
+        """Return every complete JPEG received since the last call, undecoded (used for recording)."""
+        while True:
+            self._fill()
+            jpegs = self._extract_jpegs()
+            if jpegs:
+                self.latest_jpeg = jpegs[-1]
+                return jpegs
+
+    def read(self):
+        """Return (frame, capture_time) for the newest JPEG available, dropping older ones."""
+        while True:
+            self._fill()
+            jpegs = self._extract_jpegs()
+            if not jpegs:
+                continue
+            self.frames_dropped += len(jpegs) - 1
+            jpeg = jpegs[-1]
+            captured = time.time()
+
+            self.sensor_size = jpeg_size(jpeg) or self.sensor_size
+            start = time.perf_counter()
+            frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), self._reduced_flag())
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if frame is None:
+                self.frames_dropped += 1
+                continue
+
+            self.latest_jpeg = jpeg
+            self.decode_ms = elapsed_ms if not self.frames_decoded else 0.9 * self.decode_ms + 0.1 * elapsed_ms
+            self.frames_decoded += 1
+            if self.frames_decoded % REPORT_EVERY == 0:
+                self.report()
+            return frame, captured
+
+    @property
+    def bandwidth_kbps(self):
+        elapsed = time.time() - self._started
+        return self.bytes_received * 8 / 1000 / elapsed if elapsed > 0 else 0.0
+
+    def report(self):
+        print(f"[MJPEG] decoded {self.frames_decoded}, dropped {self.frames_dropped}, "
+              f"decode {self.decode_ms:.1f} ms avg, {self.bandwidth_kbps:.0f} kbit/s, sensor {self.sensor_size}")
+
+
+# Shared reader for the ESP32 camera; the capture thread in core/app/lifecycle.py drives it
+camera_stream = MJPEGStreamReader(ESP32_STREAM_URL)
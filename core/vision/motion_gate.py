@@ -0,0 +1,72 @@
+import time
+
+import cv2
+import numpy as np
+
+from config.settings import MOTION_GATE_THRESHOLD, MOTION_GATE_MAX_REUSE
+
+THUMBNAIL_SIZE = (32, 24)
+REPORT_EVERY = 300  # gate decisions between skip-rate log lines
+
+
+def scene_thumbnail(frame, size=THUMBNAIL_SIZE):
+    """Tiny grayscale float32 copy of a frame, cheap enough to compute on every frame."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+def thumbnail_difference(a, b):
+    """Mean absolute difference between two thumbnails, scaled to 0-1."""
+    return float(np.mean(np.abs(a - b))) / 255.0
+
+
+class SceneChangeGate:
+    """
+    Skips the detector while the scene is static.
+
+    Each frame is reduced to a 32x24 grayscale thumbnail and compared with the thumbnail of the
+    last frame the detector actually ran on. Below the change threshold the previous detections
+    are reused, but never for longer than max_reuse_age seconds.
+    """
+
+    def __init__(self, threshold=MOTION_GATE_THRESHOLD, max_reuse_age=MOTION_GATE_MAX_REUSE):
+        self.threshold = threshold
+        self.max_reuse_age = max_reuse_age
+        self.inferences = 0
+        self.skipped = 0
+        self._reference = None
+        self._detections = None
+        self._detected_at = 0.0
+
+    def detect(self, frame, detector):
+        """Return ``detector(frame)``, or the previous detections if the scene has not changed."""
+        thumb = scene_thumbnail(frame)
+        now = time.time()
+        reusable = (
+            self._reference is not None
+            and now - self._detected_at < self.max_reuse_age
+            and thumbnail_difference(thumb, self._reference) < self.threshold
+        )
+        if reusable:
+            self.skipped += 1
+            detections = self._detections
+        else:
+            detections = detector(frame)
+            self.inferences += 1
+            self._reference = thumb
+            self._detections = detections
+            self._detected_at = now
+
+        if (self.inferences + self.skipped) % REPORT_EVERY == 0:
+            print(f"[MotionGate] Skipped {self.skipped} of {self.inferences + self.skipped} inferences "
+                  f"({self.skip_rate:.0%})")
+        return detections
+
+    @property
+    def skip_rate(self):
+        total = self.inferences + self.skipped
+        return self.skipped / total if total else 0.0
+
+    def reset(self):
+        self._reference = None
+        self._detections = None
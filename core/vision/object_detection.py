@@ -1,10 +1,115 @@
-from config.load_models import yolo_model
+import time
+import threading
+from concurrent.futures import Future
 
+import numpy as np
 
-def run_object_detection(frame):
-    results = yolo_model(frame, verbose=False)
-    detections = []
-    for r in results:
-        for *box, conf, cls in r.boxes.data.tolist():
-            detections.append({'bbox': tuple(map(int, box)), 'confidence': conf, 'class_id': int(cls)})
-    return detections
+from config.load_models import models
+from config.settings import DETECTOR_MAX_BATCH, DETECTOR_BATCH_WAIT_MS
+from core.vision.detectors import DETECTION_DTYPE
+
+PRODUCER_WINDOW = 1.0  # seconds a thread counts as an active producer after its last submit
+
+# detect_batch() output: every detection of the batch in one array, tagged with its frame index
+BATCH_DETECTION_DTYPE = np.dtype([('frame', np.int32)] + DETECTION_DTYPE.descr)
+
+
+def detect_batch(frames):
+    """Run the detector once over a list of frames and return a single BATCH_DETECTION_DTYPE array."""
+    per_frame = models.get('yolo').detect(frames)
+    batch = np.zeros(sum(len(dets) for dets in per_frame), dtype=BATCH_DETECTION_DTYPE)
+    start = 0
+    for index, dets in enumerate(per_frame):
+        end = start + len(dets)
+        batch['frame'][start:end] = index
+        for field in DETECTION_DTYPE.names:
+            batch[field][start:end] = dets[field]
+        start = end
+    return batch
+
+
+def split_batch(batch, frame_count):
+    """Split a detect_batch() result into per-frame DETECTION_DTYPE views (rows are frame-ordered)."""
+    bounds = np.searchsorted(batch['frame'], np.arange(frame_count + 1))
+    plain = batch[list(DETECTION_DTYPE.names)]
+    return [plain[bounds[i]:bounds[i + 1]] for i in range(frame_count)]
+
+
+class MicroBatcher:
+    """
+    Collects frames from several producers into one detector call.
+
+    The first submitted frame opens a window of max_wait_ms; frames arriving from other threads
+    (main loop, background vision, a second camera) within that window, up to max_batch, share
+    the same inference. The window is only held open while another thread that submitted within
+    PRODUCER_WINDOW seconds has no frame queued yet, so a lone producer is dispatched at once.
+    Each producer gets a Future for its own frame's detections.
+    """
+
+    def __init__(self, detect=detect_batch, max_batch=DETECTOR_MAX_BATCH, max_wait_ms=DETECTOR_BATCH_WAIT_MS):
+        self._detect = detect
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.frames = 0
+        self._pending = []
+        self._producers = {}  # thread ident -> time of its last submit
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="DetectorBatcher", daemon=True)
+            self._thread.start()
+
+    def submit(self, frame):
+        self.start()
+        future = Future()
+        with self._cond:
+            producer = threading.get_ident()
+            self._producers[producer] = time.monotonic()
+            self._pending.append((frame, future, producer))
+            self._cond.notify()
+        return future
+
+    def detect(self, frame):
+        """Blocking convenience wrapper: detections for one frame via the shared batch."""
+        return self.submit(frame).result()
+
+    @property
+    def mean_batch_size(self):
+        return self.frames / self.batches if self.batches else 0.0
+
+    def _collect(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending)
+            now = time.monotonic()
+            self._producers = {ident: seen for ident, seen in self._producers.items() if now - seen < PRODUCER_WINDOW}
+            deadline = now + self.max_wait
+            # Wait only for active producers that have nothing queued yet
+            while len(self._pending) < self.max_batch and \
+                    len({producer for _, _, producer in self._pending}) < len(self._producers):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    break
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            frames = [frame for frame, _, _ in batch]
+            try:
+                results = split_batch(self._detect(frames), len(frames))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.frames += len(frames)
+            for (_, future, _), detections in zip(batch, results):
+                future.set_result(detections)
+
+
+detector_batcher = MicroBatcher()
@@ -0,0 +1,61 @@
+import numpy as np
+
+from config.settings import OBSTACLE_BAND_DEPTHS, OBSTACLE_MIN_FRACTION, OBSTACLE_ROWS
+
+COLUMNS = ('left', 'center', 'right')
+BANDS = ('near', 'mid', 'far')
+PHRASES = {
+    'left': "obstacle on your left",
+    'center': "obstacle ahead",
+    'right': "obstacle on your right",
+}
+
+
+class OccupancyGrid:
+    """
+    Class-agnostic obstacle map built straight from the depth map.
+
+    The horizontal band of the depth map between OBSTACLE_ROWS (which leaves out most of the
+    floor and the sky) is split into left/center/right columns, and each column's pixels are
+    binned into near/mid/far by raw depth. MiDaS outputs inverse relative depth, so larger raw
+    values are nearer and the band edges are lower bounds. That is a couple of comparisons and
+    means over the 256x256 map, done once per depth refresh, so walls, poles and other things
+    YOLO has no class for still raise a warning.
+    """
+
+    def __init__(self, band_depths=OBSTACLE_BAND_DEPTHS, min_fraction=OBSTACLE_MIN_FRACTION, rows=OBSTACLE_ROWS):
+        self.band_depths = band_depths
+        self.min_fraction = min_fraction
+        self.rows = rows
+        self.grid = np.zeros((len(COLUMNS), len(BANDS)), dtype=np.float32)
+        self._depth_map = None
+
+    def update(self, depth_map):
+        """Recompute the (columns, bands) occupancy fractions; a no-op for the same DepthMap."""
+        if depth_map is self._depth_map:
+            return self.grid
+        raw = depth_map.raw
+        top, bottom = int(raw.shape[0] * self.rows[0]), int(raw.shape[0] * self.rows[1])
+        width = raw.shape[1] // len(COLUMNS) * len(COLUMNS)
+        columns = raw[top:bottom, :width].reshape(bottom - top, len(COLUMNS), -1)
+
+        # Cumulative share of each column nearer than each band edge (inverse depth, so above it),
+        # then per-band differences
+        near_depth, mid_depth = self.band_depths
+        nearer = np.stack([(columns > near_depth).mean(axis=(0, 2)),
+                           (columns > mid_depth).mean(axis=(0, 2)),
+                           np.ones(len(COLUMNS))], axis=1)
+        self.grid = np.diff(nearer, axis=1, prepend=0.0).astype(np.float32)
+        self._depth_map = depth_map
+        return self.grid
+
+    def blocked(self):
+        """Column names whose near band holds at least min_fraction of the column."""
+        return [COLUMNS[i] for i in np.flatnonzero(self.grid[:, 0] >= self.min_fraction)]
+
+    @staticmethod
+    def columns_of(boxes, frame_width):
+        """Column names containing the centers of (N, 4) frame-coordinate boxes."""
+        centers = (np.asarray(boxes, dtype=np.float32).reshape(-1, 4)[:, [0, 2]].mean(axis=1))
+        index = np.clip((centers / frame_width * len(COLUMNS)).astype(int), 0, len(COLUMNS) - 1)
+        return {COLUMNS[i] for i in index}
@@ -1,20 +1,39 @@
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from dotenv import load_dotenv
 
+from config.settings import OCR_BACKEND, OCR_LANGUAGE, OCR_LOCAL_WORKERS, OCR_TESSERACT_CONFIG, OCR_REMOTE_TIMEOUT, \
+    OCR_REMOTE_RETRY_AFTER, OCR_LOCAL_SLOW_MS
+from core.vision.image_payload import build_jpeg_payload
+from core.vision.text_regions import stack_images
+
 load_dotenv()
 OCR_API_KEY = os.getenv("OCR_API_KEY")
 
+
 def ocr_space_file(filename, api_key=OCR_API_KEY, language='eng'):
+    with open(filename, 'rb') as f:
+        return ocr_space_upload((os.path.basename(filename), f), api_key, language)
+
+
+def ocr_space_image(payload, api_key=OCR_API_KEY, language='eng', timeout=OCR_REMOTE_TIMEOUT):
+    """OCR an in-memory ImagePayload without touching the disk."""
+    return ocr_space_upload(payload.as_upload(), api_key, language, timeout)
+
+
+def ocr_space_upload(upload, api_key=OCR_API_KEY, language='eng', timeout=OCR_REMOTE_TIMEOUT):
     print('sending request')
     url = 'https://api.ocr.space/parse/image'
-    with open(filename, 'rb') as f:
-        payload = {
-            'isOverlayRequired': False,
-            'apikey': api_key,
-            'language': language,
-        }
-        response = requests.post(url, files={'filename': f}, data=payload, timeout=30)
+    payload = {
+        'isOverlayRequired': False,
+        'apikey': api_key,
+        'language': language,
+    }
+    response = requests.post(url, files={'filename': upload}, data=payload, timeout=timeout)
     print('gotten response')
 
     result = response.json()
@@ -29,3 +48,133 @@ def ocr_space_file(filename, api_key=OCR_API_KEY, language='eng'):
         return ""
 
     return parsed_results[0].get("ParsedText", "")
+
+
+class OcrBackend:
+    """
+    Common interface for OCR engines.
+
+    ``recognize(images)`` takes the deskewed text crops of one capture, in reading order, and
+    returns their text as one string.
+    """
+
+    name = None
+
+    def recognize(self, images):
+        raise NotImplementedError
+
+
+class TesseractBackend(OcrBackend):
+    """Local Tesseract; each crop is recognized on its own worker so blocks are read in parallel."""
+
+    name = "tesseract"
+
+    def __init__(self, workers=OCR_LOCAL_WORKERS, language=OCR_LANGUAGE, config=OCR_TESSERACT_CONFIG):
+        import pytesseract
+
+        self.pytesseract = pytesseract
+        self.language = language
+        self.config = config
+        # pytesseract runs the tesseract binary in a subprocess, so threads are enough for parallelism
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Tesseract")
+
+    def _recognize_one(self, image):
+        return self.pytesseract.image_to_string(image[:, :, ::-1], lang=self.language, config=self.config).strip()
+
+    def recognize(self, images):
+        return "\n".join(text for text in self._pool.map(self._recognize_one, images) if text)
+
+
+class OcrSpaceBackend(OcrBackend):
+    """OCR.space over HTTP; all crops go up stacked in a single JPEG upload."""
+
+    name = "ocr.space"
+
+    def __init__(self, api_key=OCR_API_KEY, language=OCR_LANGUAGE, timeout=OCR_REMOTE_TIMEOUT):
+        if not api_key:
+            raise RuntimeError("OCR_API_KEY is not set")
+        self.api_key = api_key
+        self.language = language
+        self.timeout = timeout
+
+    def recognize(self, images):
+        payload = build_jpeg_payload(stack_images(images), tag="OCR")
+        return ocr_space_image(payload, self.api_key, self.language, self.timeout).strip()
+
+
+class OcrRouter:
+    """
+    Chooses between the local and the remote OCR engine for each read.
+
+    The preferred engine (OCR_BACKEND) is used unless the policy says otherwise: a remote call
+    that failed marks the link down for retry_after seconds, and while the link is up a local
+    engine whose moving-average latency exceeds local_slow_ms loses to a faster remote one.
+    If the chosen engine errors or returns nothing, the other one is tried.
+    """
+
+    BACKENDS = {'tesseract': TesseractBackend, 'ocr.space': OcrSpaceBackend}
+
+    def __init__(self, preferred=OCR_BACKEND, retry_after=OCR_REMOTE_RETRY_AFTER, local_slow_ms=OCR_LOCAL_SLOW_MS):
+        self.preferred = preferred
+        self.retry_after = retry_after
+        self.local_slow_ms = local_slow_ms
+        self.latency_ms = {}
+        self._backends = {}
+        self._unavailable = set()
+        self._link_down_until = 0.0
+        self._lock = threading.Lock()
+
+    def _backend(self, name):
+        with self._lock:
+            if name in self._unavailable:
+                return None
+            if name not in self._backends:
+                try:
+                    self._backends[name] = self.BACKENDS[name]()
+                except Exception as e:
+                    print(f"[OCR] {name} unavailable: {e}")
+                    self._unavailable.add(name)
+                    return None
+            return self._backends[name]
+
+    @property
+    def link_up(self):
+        return time.time() >= self._link_down_until
+
+    def order(self):
+        """Backend names in the order this read should try them."""
+        local, remote = 'tesseract', 'ocr.space'
+        if not self.link_up:
+            return [local]
+        first = self.preferred
+        local_ms, remote_ms = self.latency_ms.get(local), self.latency_ms.get(remote)
+        if first == local and local_ms is not None and local_ms > self.local_slow_ms \
+                and (remote_ms is None or remote_ms < local_ms):
+            first = remote
+        elif first == remote and remote_ms is not None and local_ms is not None and local_ms < remote_ms:
+            first = local
+        return [first, remote if first == local else local]
+
+    def recognize(self, images):
+        for name in self.order():
+            backend = self._backend(name)
+            if backend is None:
+                continue
+            start = time.perf_counter()
+            try:
+                text = backend.recognize(images)
+            except Exception as e:
+                print(f"[OCR] {name} failed: {e}")
+                if name == 'ocr.space':
+                    self._link_down_until = time.time() + self.retry_after
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            previous = self.latency_ms.get(name)
+            self.latency_ms[name] = elapsed_ms if previous is None else 0.7 * previous + 0.3 * elapsed_ms
+            print(f"[OCR] {name}: {len(text)} characters from {len(images)} regions in {elapsed_ms:.0f} ms")
+            if text:
+                return text
+        return ""
+
+
+ocr_engine = OcrRouter()
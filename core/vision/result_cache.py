@@ -0,0 +1,74 @@
+import time
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from config.settings import RESULT_CACHE_SIZE, RESULT_CACHE_TTL, RESULT_CACHE_MAX_DISTANCE
+
+
+def perceptual_hash(image):
+    """64-bit DCT hash: low-frequency 8x8 DCT coefficients of a 32x32 grayscale copy against their median."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].flatten()
+    bits = low[1:] > np.median(low[1:])  # skip the DC term, it only tracks overall brightness
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class PerceptualCache:
+    """
+    Result cache keyed by a perceptual hash of the captured frame.
+
+    A lookup hits the most recently used entry whose hash is within max_distance bits and
+    which is younger than ttl seconds, so pressing read or count again on the same page or
+    notes answers instantly. Least recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, name, max_entries=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL, max_distance=RESULT_CACHE_MAX_DISTANCE):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # hash -> (value, stored_at)
+        self._lock = threading.Lock()
+
+    def lookup(self, image):
+        """Return (key, value); value is None on a miss. Pass the key to store() after computing."""
+        key = perceptual_hash(image)
+        now = time.time()
+        with self._lock:
+            for stale in [k for k, (_, stored_at) in self._entries.items() if now - stored_at > self.ttl]:
+                del self._entries[stale]
+            match = min(self._entries, key=lambda k: hamming_distance(k, key), default=None)
+            if match is not None and hamming_distance(match, key) <= self.max_distance:
+                self._entries.move_to_end(match)
+                value, stored_at = self._entries[match]
+                self.hits += 1
+                print(f"[Cache] {self.name} hit: distance {hamming_distance(match, key)} bits, "
+                      f"stored {now - stored_at:.0f}s ago ({self.hits} hits, {self.misses} misses)")
+                return key, value
+            self.misses += 1
+        return key, None
+
+    def store(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+ocr_cache = PerceptualCache("OCR")
+currency_cache = PerceptualCache("Currency")
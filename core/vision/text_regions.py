@@ -0,0 +1,88 @@
+import time
+
+import cv2
+import numpy as np
+
+from config.load_models import models
+from config.settings import TEXT_DETECTOR_MODEL, TEXT_DETECTOR_INPUT, TEXT_CONF_THRESHOLD, TEXT_NMS_THRESHOLD, \
+    TEXT_REGION_PADDING
+
+MASK_SCALE = 0.25  # word boxes are merged into blocks on a quarter-resolution mask
+MOSAIC_GAP = 16  # white pixels between stacked regions in the upload
+
+
+def load_text_detector(path=TEXT_DETECTOR_MODEL, input_size=TEXT_DETECTOR_INPUT):
+    detector = cv2.dnn.TextDetectionModel_EAST(path)
+    detector.setConfidenceThreshold(TEXT_CONF_THRESHOLD)
+    detector.setNMSThreshold(TEXT_NMS_THRESHOLD)
+    detector.setInputParams(1.0, input_size, (123.68, 116.78, 103.94), True)
+    return detector
+
+
+def normalize_rect(rect):
+    """Rotated rect with the angle in (-45, 45] and width along the text line."""
+    center, (width, height), angle = rect
+    if angle > 45:
+        angle -= 90
+        width, height = height, width
+    elif angle <= -45:
+        angle += 90
+        width, height = height, width
+    return center, (width, height), angle
+
+
+def find_text_regions(frame, detector=None):
+    """
+    Detect text blocks in a BGR frame; returns normalized rotated rects in reading order.
+
+    EAST finds word-level boxes. They are drawn on a low-resolution mask, dilated along the
+    line so neighbouring words and lines fuse, and each connected block becomes one rotated
+    rect.
+    """
+    detector = detector or models.get('text_detector')
+    start = time.perf_counter()
+    words, _ = detector.detectTextRectangles(frame)
+    if not len(words):
+        print(f"[Text] No text regions ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return []
+
+    height, width = frame.shape[:2]
+    mask = np.zeros((int(height * MASK_SCALE) + 1, int(width * MASK_SCALE) + 1), dtype=np.uint8)
+    for word in words:
+        cv2.fillPoly(mask, [np.round(cv2.boxPoints(word) * MASK_SCALE).astype(np.int32)], 255)
+    line_height = max(1, int(np.median([min(size) for _, size, _ in words]) * MASK_SCALE))
+    mask = cv2.dilate(mask, cv2.getStructuringElement(cv2.MORPH_RECT, (2 * line_height + 1, line_height // 2 + 1)))
+
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    regions = [normalize_rect(cv2.minAreaRect((contour / MASK_SCALE).astype(np.float32))) for contour in contours]
+    regions.sort(key=lambda rect: (rect[0][1] - rect[1][1] / 2, rect[0][0]))  # top edge, then left to right
+    print(f"[Text] {len(words)} words in {len(regions)} regions ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return regions
+
+
+def crop_region(frame, rect, padding=TEXT_REGION_PADDING):
+    """Cut a rotated rect out of the frame, deskewed to horizontal, with padding around the text."""
+    (cx, cy), (width, height), angle = rect
+    pad = padding * height
+    out_width, out_height = int(width + 2 * pad), int(height + 2 * pad)
+    # Rotate about the region's center and move it to the middle of the output in one warp
+    matrix = cv2.getRotationMatrix2D((cx, cy), angle, 1.0)
+    matrix[:, 2] += (out_width / 2 - cx, out_height / 2 - cy)
+    return cv2.warpAffine(frame, matrix, (out_width, out_height), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_REPLICATE)
+
+
+def crop_regions(frame, regions):
+    return [crop_region(frame, rect) for rect in regions]
+
+
+def stack_images(crops):
+    """Stack crops top to bottom on white, so one upload carries all of them."""
+    width = max(crop.shape[1] for crop in crops)
+    height = sum(crop.shape[0] for crop in crops) + MOSAIC_GAP * (len(crops) - 1)
+    mosaic = np.full((height, width, 3), 255, dtype=np.uint8)
+    y = 0
+    for crop in crops:
+        mosaic[y:y + crop.shape[0], :crop.shape[1]] = crop
+        y += crop.shape[0] + MOSAIC_GAP
+    return mosaic
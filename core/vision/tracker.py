@@ -0,0 +1,168 @@
+import time
+
+import numpy as np
+
+from config.settings import TRACKER_IOU_THRESHOLD, TRACKER_CENTROID_DISTANCE, TRACKER_MAX_MISSES, \
+    TRACKER_APPROACH_RATE
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU between (T, 4) and (N, 4) x1, y1, x2, y2 boxes."""
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-6)
+
+
+def box_area(box):
+    return max(0.0, float(box[2] - box[0])) * max(0.0, float(box[3] - box[1]))
+
+
+class Track:
+    def __init__(self, track_id, box, confidence, class_name, now):
+        self.track_id = track_id
+        self.box = np.asarray(box, dtype=np.float32)
+        self.velocity = np.zeros(4, dtype=np.float32)  # box corners, pixels per second
+        self.confidence = confidence
+        self.class_name = class_name
+        self.area_rate = 0.0  # relative box-area growth per second; positive means approaching
+        self.misses = 0
+        self.hits = 1
+        self.close = False
+        self.announced = False
+        self.approach_announced = False
+        self.updated_at = now
+        self.measured_box = self.box.copy()  # last detector box, used for velocity estimates
+        self.measured_at = now
+
+    def predicted_box(self, now):
+        return self.box + self.velocity * (now - self.updated_at)
+
+
+class ObjectTracker:
+    """
+    SORT-style tracker between the detector and the announcer.
+
+    Detections are matched to tracks greedily by IoU, falling back to centroid distance for
+    fast-moving boxes, within the same class. Tracks keep a constant-velocity estimate, so
+    between detector runs propagate() moves them forward without inference. Each track is
+    announced once when it first becomes close, and again only if it approaches faster than
+    TRACKER_APPROACH_RATE.
+    """
+
+    def __init__(self, iou_threshold=TRACKER_IOU_THRESHOLD, centroid_distance=TRACKER_CENTROID_DISTANCE,
+                 max_misses=TRACKER_MAX_MISSES, approach_rate=TRACKER_APPROACH_RATE):
+        self.iou_threshold = iou_threshold
+        self.centroid_distance = centroid_distance
+        self.max_misses = max_misses
+        self.approach_rate = approach_rate
+        self.tracks = []
+        self._next_id = 1
+
+    def boxes(self, now=None):
+        now = time.time() if now is None else now
+        if not self.tracks:
+            return np.zeros((0, 4), dtype=np.float32)
+        return np.stack([track.predicted_box(now) for track in self.tracks])
+
+    def propagate(self, now=None):
+        """Advance every track to ``now`` on its velocity estimate (no detector run)."""
+        now = time.time() if now is None else now
+        for track in self.tracks:
+            track.box = track.predicted_box(now)
+            track.updated_at = now
+
+    def _match(self, predicted, boxes, class_names):
+        if not len(predicted) or not len(boxes):
+            return []
+        same_class = np.array([[track.class_name == name for name in class_names] for track in self.tracks])
+        scores = np.where(same_class, iou_matrix(predicted, boxes), 0.0)
+
+        matches = []
+        while scores.size and scores.max() >= self.iou_threshold:
+            t, d = np.unravel_index(np.argmax(scores), scores.shape)
+            matches.append((t, d))
+            scores[t, :] = 0.0
+            scores[:, d] = 0.0
+
+        # Centroid fallback for pairs IoU could not link (small or fast-moving boxes)
+        matched_t = {t for t, _ in matches}
+        matched_d = {d for _, d in matches}
+        centers_t = (predicted[:, :2] + predicted[:, 2:]) / 2
+        centers_d = (boxes[:, :2] + boxes[:, 2:]) / 2
+        diagonals = np.linalg.norm(predicted[:, 2:] - predicted[:, :2], axis=1)
+        distances = np.linalg.norm(centers_t[:, None] - centers_d[None], axis=2) / (diagonals[:, None] + 1e-6)
+        distances = np.where(same_class, distances, np.inf)
+        distances[list(matched_t), :] = np.inf
+        distances[:, list(matched_d)] = np.inf
+        while distances.size and distances.min() < self.centroid_distance:
+            t, d = np.unravel_index(np.argmin(distances), distances.shape)
+            matches.append((t, d))
+            distances[t, :] = np.inf
+            distances[:, d] = np.inf
+        return matches
+
+    def update(self, boxes, confidences, class_names, now=None):
+        """Fold a detector run into the tracks. Returns the current track list."""
+        now = time.time() if now is None else now
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        predicted = self.boxes(now)
+        matches = self._match(predicted, boxes, class_names)
+
+        matched_tracks = set()
+        matched_detections = set()
+        for t, d in matches:
+            track = self.tracks[t]
+            dt = now - track.measured_at
+            if dt > 0:
+                velocity = (boxes[d] - track.measured_box) / dt
+                track.velocity = 0.5 * track.velocity + 0.5 * velocity
+                previous_area = box_area(track.measured_box)
+                if previous_area > 0:
+                    rate = (box_area(boxes[d]) - previous_area) / previous_area / dt
+                    track.area_rate = 0.5 * track.area_rate + 0.5 * rate
+            track.box = boxes[d].copy()
+            track.measured_box = track.box.copy()
+            track.measured_at = now
+            track.confidence = float(confidences[d])
+            track.updated_at = now
+            track.misses = 0
+            track.hits += 1
+            matched_tracks.add(t)
+            matched_detections.add(d)
+
+        for t, track in enumerate(self.tracks):
+            if t not in matched_tracks:
+                track.box = track.predicted_box(now)
+                track.updated_at = now
+                track.misses += 1
+        self.tracks = [track for track in self.tracks if track.misses <= self.max_misses]
+
+        for d in range(len(boxes)):
+            if d not in matched_detections:
+                self.tracks.append(Track(self._next_id, boxes[d], float(confidences[d]), class_names[d], now))
+                self._next_id += 1
+        return self.tracks
+
+    def mark_close(self, close_flags):
+        """Record per-track closeness and return the tracks that should be announced now."""
+        to_announce = []
+        for track, close in zip(self.tracks, close_flags):
+            track.close = bool(close)
+            if not track.close:
+                # Re-arm once the object is no longer close
+                track.announced = False
+                track.approach_announced = False
+                continue
+            if not track.announced:
+                track.announced = True
+                to_announce.append(track)
+            elif track.area_rate > self.approach_rate and not track.approach_announced:
+                track.approach_announced = True
+                to_announce.append(track)
+        return to_announce
+
+    def reset(self):
+        self.tracks = []
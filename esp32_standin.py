@@ -0,0 +1,386 @@
+"""
+Local stand-in for the ESP32 camera board, plus a session recorder.
+
+serve     Serve a recorded session, video file or image folder as the ESP32 MJPEG stream
+          (/stream) at a fixed frame rate or the recorded timing, and emulate the /control
+          endpoint (framesize and quality change the frames that are served).
+commands  Act as the ESP32 on the TCP command channel: connect to the app's listener on
+          port 5678, replay a command script or recorded session, and print the replies.
+record    Capture a real session to disk: every JPEG from the real stream, with timestamps,
+          and (optionally) the TCP command traffic by proxying the ESP32 to the app.
+
+Point the app at the stand-in with:
+    ESP32_CAMERA_URL=http://localhost:8080 ESP32_STREAM_URL=http://localhost:8081/stream python main.py
+
+Examples:
+    python esp32_standin.py record sessions/walk --duration 60 --proxy-port 5679
+    python esp32_standin.py serve sessions/walk --realtime
+    python esp32_standin.py serve recordings/walk.mp4 --fps 15
+    python esp32_standin.py commands --script sessions/walk/commands.jsonl
+"""
+import os
+import json
+import time
+import socket
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import cv2
+import numpy as np
+
+from config.settings import ESP32_STREAM_URL
+from core.vision.camera_control import FRAMESIZES
+from core.vision.mjpeg_stream import MJPEGStreamReader
+
+BOUNDARY = "123456789000000000000987654321"  # same boundary the ESP32 camera firmware uses
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+INDEX_FILE = "index.jsonl"
+COMMANDS_FILE = "commands.jsonl"
+
+
+# ------------------ Frame sources ------------------
+def load_session(path):
+    """Return [(jpeg_bytes, timestamp_or_None), ...] from a recorded session, image folder or video."""
+    index_path = os.path.join(path, INDEX_FILE)
+    if os.path.isfile(index_path):
+        frames = []
+        with open(index_path) as f:
+            for line in f:
+                entry = json.loads(line)
+                with open(os.path.join(path, entry['file']), 'rb') as image:
+                    frames.append((image.read(), entry['t']))
+        return frames
+
+    if os.path.isdir(path):
+        frames = []
+        for name in sorted(os.listdir(path)):
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            image = cv2.imread(os.path.join(path, name), cv2.IMREAD_COLOR)
+            if image is not None:
+                frames.append((cv2.imencode('.jpg', image)[1].tobytes(), None))
+        return frames
+
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ok, image = cap.read()
+        if not ok:
+            break
+        frames.append((cv2.imencode('.jpg', image)[1].tobytes(), None))
+    cap.release()
+    return frames
+
+
+def esp32_quality_to_jpeg(quality):
+    """ESP32 quality runs 10 (best) to 63 (worst); map it onto OpenCV's 100..5 scale."""
+    return int(np.interp(quality, [10, 63], [95, 5]))
+
+
+class CameraState:
+    def __init__(self):
+        self.framesize = None
+        self.quality = None
+        self.awb = 1
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def render(self, jpeg):
+        """Apply the emulated framesize/quality; untouched recordings are served byte-for-byte."""
+        with self.lock:
+            framesize, quality = self.framesize, self.quality
+        if framesize is None and quality is None:
+            return jpeg
+        image = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if framesize is not None:
+            image = cv2.resize(image, FRAMESIZES[framesize], interpolation=cv2.INTER_AREA)
+        params = [cv2.IMWRITE_JPEG_QUALITY, esp32_quality_to_jpeg(quality if quality is not None else 12)]
+        return cv2.imencode('.jpg', image, params)[1].tobytes()
+
+
+# ------------------ HTTP servers ------------------
+def make_stream_handler(frames, state, fps, realtime):
+    class StreamHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if urlparse(self.path).path != "/stream":
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", f"multipart/x-mixed-replace;boundary={BOUNDARY}")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            print(f"[Standin] Stream client connected: {self.client_address}")
+            try:
+                while True:
+                    self._play_once()
+            except (BrokenPipeError, ConnectionResetError):
+                print(f"[Standin] Stream client disconnected: {self.client_address}")
+
+        def _play_once(self):
+            previous = None
+            next_due = time.time()
+            for jpeg, recorded_at in frames:
+                if realtime and recorded_at is not None and previous is not None:
+                    next_due += max(0.0, recorded_at - previous)
+                else:
+                    next_due += 1.0 / fps
+                previous = recorded_at
+                delay = next_due - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+
+                body = state.render(jpeg)
+                now = time.time()
+                self.wfile.write(
+                    f"\r\n--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(body)}\r\n"
+                    f"X-Timestamp: {int(now)}.{int((now % 1) * 1e6):06d}\r\n\r\n".encode() + body)
+
+    return StreamHandler
+
+
+def make_control_handler(state):
+    class ControlHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, code, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path == "/status":
+                with state.lock:
+                    self._reply(200, {'framesize': state.framesize, 'quality': state.quality, 'awb': state.awb,
+                                      'requests': state.requests[-50:]})
+                return
+            if parsed.path != "/control":
+                self.send_error(404)
+                return
+
+            query = parse_qs(parsed.query)
+            var, val = query.get('var', [None])[0], query.get('val', [None])[0]
+            try:
+                val = int(val)
+            except (TypeError, ValueError):
+                self._reply(400, {'error': 'val must be an integer'})
+                return
+            with state.lock:
+                state.requests.append({'t': time.time(), 'var': var, 'val': val})
+                if var == 'framesize' and val in FRAMESIZES:
+                    state.framesize = val
+                elif var == 'quality' and 10 <= val <= 63:
+                    state.quality = val
+                elif var == 'awb':
+                    state.awb = val
+                else:
+                    self._reply(400, {'error': f'unsupported {var}={val}'})
+                    return
+            print(f"[Standin] /control {var}={val}")
+            self._reply(200, {'var': var, 'val': val})
+
+    return ControlHandler
+
+
+def serve(args):
+    frames = load_session(args.source)
+    if not frames:
+        raise SystemExit(f"No frames found in {args.source}")
+    state = CameraState()
+    stream_server = ThreadingHTTPServer((args.host, args.stream_port),
+                                        make_stream_handler(frames, state, args.fps, args.realtime))
+    control_server = ThreadingHTTPServer((args.host, args.control_port), make_control_handler(state))
+    threading.Thread(target=control_server.serve_forever, daemon=True).start()
+    print(f"[Standin] Serving {len(frames)} frames on http://{args.host}:{args.stream_port}/stream, "
+          f"control on http://{args.host}:{args.control_port}/control")
+    try:
+        stream_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stream_server.shutdown()
+        control_server.shutdown()
+
+
+# ------------------ TCP command channel ------------------
+def load_script(path):
+    """Commands as [(delay_seconds, line)], from a recorded commands.jsonl or a plain 'delay COMMAND' file."""
+    steps = []
+    with open(path) as f:
+        if path.endswith(".jsonl"):
+            previous = None
+            for line in f:
+                entry = json.loads(line)
+                if entry['from'] != 'esp32':
+                    continue
+                steps.append((0.0 if previous is None else entry['t'] - previous, entry['line']))
+                previous = entry['t']
+        else:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                delay, _, command = line.partition(" ")
+                steps.append((float(delay), command.strip()))
+    return steps
+
+
+def send_audio(conn, wav_path):
+    import wave
+    with wave.open(wav_path, 'rb') as wf:
+        pcm = wf.readframes(wf.getnframes())
+    conn.sendall(b"AUDIO_START\n")
+    time.sleep(0.05)
+    conn.sendall(pcm + b"AUDIO_END")
+
+
+def commands(args):
+    conn = socket.create_connection((args.host, args.port))
+    print(f"[Standin] Connected to app listener at {args.host}:{args.port}")
+
+    def print_replies():
+        buffer = b""
+        while True:
+            data = conn.recv(4096)
+            if not data:
+                print("[Standin] App closed the connection")
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                print(f"[Standin] <- {line.decode(errors='ignore')}")
+
+    threading.Thread(target=print_replies, daemon=True).start()
+    steps = load_script(args.script) if args.script else [(0.0, command) for command in args.command]
+    for delay, line in steps:
+        time.sleep(delay)
+        print(f"[Standin] -> {line}")
+        if line.upper() == "AUDIO_START" and args.audio:
+            send_audio(conn, args.audio)
+        else:
+            conn.sendall((line + "\n").encode())
+    time.sleep(args.linger)
+    conn.close()
+
+
+# ------------------ Recorder ------------------
+def proxy_commands(listen_port, app_host, app_port, log_path, stop):
+    """Let the real ESP32 connect here; forward both ways to the app and log every line."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(("0.0.0.0", listen_port))
+    server.listen(1)
+    server.settimeout(1.0)
+    log_lock = threading.Lock()
+
+    def pump(source, target, direction, log):
+        buffer = b""
+        while not stop.is_set():
+            try:
+                data = source.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return
+            target.sendall(data)
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                with log_lock:
+                    log.write(json.dumps({'t': time.time(), 'from': direction,
+                                          'line': line.decode(errors='ignore').strip()}) + "\n")
+                    log.flush()
+
+    with open(log_path, "a") as log:
+        while not stop.is_set():
+            try:
+                esp32, addr = server.accept()
+            except socket.timeout:
+                continue
+            print(f"[Recorder] ESP32 connected from {addr}, proxying to {app_host}:{app_port}")
+            app = socket.create_connection((app_host, app_port))
+            threading.Thread(target=pump, args=(app, esp32, 'app', log), daemon=True).start()
+            pump(esp32, app, 'esp32', log)
+            esp32.close()
+            app.close()
+    server.close()
+
+
+def record(args):
+    # A second session in the same folder would overwrite frames and interleave index rows
+    if os.path.isdir(args.output) and os.listdir(args.output):
+        raise SystemExit(f"{args.output} is not empty; record each session into a new folder")
+    os.makedirs(args.output, exist_ok=True)
+    stop = threading.Event()
+    if args.proxy_port:
+        threading.Thread(target=proxy_commands, daemon=True,
+                         args=(args.proxy_port, args.app_host, args.app_port,
+                               os.path.join(args.output, COMMANDS_FILE), stop)).start()
+
+    reader = MJPEGStreamReader(args.url).open()
+    deadline = time.time() + args.duration if args.duration else None
+    count = 0
+    print(f"[Recorder] Recording {args.url} into {args.output}")
+    try:
+        with open(os.path.join(args.output, INDEX_FILE), "a") as index:
+            while deadline is None or time.time() < deadline:
+                for jpeg in reader.read_jpegs():
+                    count += 1
+                    name = f"{count:06d}.jpg"
+                    with open(os.path.join(args.output, name), "wb") as f:
+                        f.write(jpeg)
+                    index.write(json.dumps({'file': name, 't': time.time(), 'bytes': len(jpeg)}) + "\n")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        reader.close()
+    print(f"[Recorder] Saved {count} frames to {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ESP32 camera/command stand-in and session recorder.")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    p = sub.add_parser("serve", help="serve a recording as the ESP32 stream and /control endpoint")
+    p.add_argument("source", help="recorded session folder, image folder or video file")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--stream-port", type=int, default=8081)
+    p.add_argument("--control-port", type=int, default=8080)
+    p.add_argument("--fps", type=float, default=15.0)
+    p.add_argument("--realtime", action="store_true", help="use recorded frame timing when available")
+    p.set_defaults(func=serve)
+
+    p = sub.add_parser("commands", help="replay TCP commands against the app's ESP32 listener")
+    p.add_argument("command", nargs="*", help="commands to send, e.g. GET_MODE MODE_OCR")
+    p.add_argument("--script", help="commands.jsonl from a recording, or a text file of 'delay COMMAND' lines")
+    p.add_argument("--audio", help="wav file streamed after AUDIO_START")
+    p.add_argument("--host", default="localhost")
+    p.add_argument("--port", type=int, default=5678)
+    p.add_argument("--linger", type=float, default=2.0, help="seconds to keep printing replies at the end")
+    p.set_defaults(func=commands)
+
+    p = sub.add_parser("record", help="record a real ESP32 session to disk")
+    p.add_argument("output", help="session folder to write")
+    p.add_argument("--url", default=ESP32_STREAM_URL)
+    p.add_argument("--duration", type=float, default=None, help="seconds to record (default: until Ctrl+C)")
+    p.add_argument("--proxy-port", type=int, default=None, help="also proxy and log the TCP command channel")
+    p.add_argument("--app-host", default="localhost")
+    p.add_argument("--app-port", type=int, default=5678)
+    p.set_defaults(func=record)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
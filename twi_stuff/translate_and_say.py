@@ -1,20 +1,36 @@
 import re
 from core.audio.audio_capture import play_audio_winsound
+from core.tts.piper import scale_volume
 from twi_stuff.eng_to_twi import translate_text
 from twi_stuff.twi_tts import synthesize_speech
 
 import os
 
 
-def translate_and_play(text, wait_for_completion=False):
+def translate_and_play(text, wait_for_completion=False, volume=1):
     safe_filename = f"data/twi/{re.sub(r'[^a-zA-Z0-9_]', '', text.replace(' ', '_')).lower()}.wav"
 
     if os.path.exists(safe_filename):
-        play_audio_winsound(safe_filename, wait_for_completion)
+        _play_at_volume(safe_filename, wait_for_completion, volume)
+        return True
     else:
         translated = translate_text(text, "en-tw")
         success = synthesize_speech(translated, output_filename=safe_filename)
         if success:
-            play_audio_winsound(safe_filename, wait_for_completion)
+            _play_at_volume(safe_filename, wait_for_completion, volume)
+            return True
         else:
             print("❌ Failed to synthesize or play audio.")
+            return False
+
+
+def _play_at_volume(filename, wait_for_completion, volume):
+    # The cached recording stays at full volume; a quieter copy is played instead
+    if volume < 1:
+        with open(filename, 'rb') as f:
+            audio = scale_volume(f.read(), volume)
+        filename = 'audio_capture/twi_output.wav'
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, 'wb') as f:
+            f.write(audio)
+    play_audio_winsound(filename, wait_for_completion)
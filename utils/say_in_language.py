@@ -2,8 +2,8 @@ from core.tts.piper import send_text_to_tts
 from twi_stuff.translate_and_say import translate_and_play
 
 
-def say_in_language(text, language, wait_for_completion=False, priority=0):
+def say_in_language(text, language, wait_for_completion=False, priority=0, volume=1):
+    """Speak text in the user's language; returns True if it was played."""
     if language == 'twi':
-        translate_and_play(text, wait_for_completion)
-    else:
-        send_text_to_tts(text, wait_for_completion, priority)
+        return translate_and_play(text, wait_for_completion, volume)
+    return send_text_to_tts(text, wait_for_completion, priority, volume)